@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=['win32crypt'],
+    hiddenimports=['win32crypt', 'strm_core', 'strm_gui'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,117 @@
+"""Benchmark: volledige JSON-decode versus streamende ingestie van get_vod_streams.
+
+Start een lokale HTTP-server met een synthetische get_vod_streams-response en laat
+elke modus in een eigen subprocess laden, zodat de piek-RSS per modus zuiver is.
+Beide modi gebruiken de echte code van StrmEngine (_api_get of _api_stream en _ingest_streams).
+
+Gebruik:
+    py benchmarks/bench_ingest.py --items 200000
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Geeft de piek-RSS van dit proces in MB, of None als dat niet te meten is."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Statische bestandsserver zonder request-logging op stderr."""
+    def log_message(self, *args):
+        pass
+
+
+def write_payload(path, items):
+    """Schrijft een get_vod_streams-achtige JSON-array met het opgegeven aantal films."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(items):
+            if i: f.write(",")
+            json.dump({
+                "num": i + 1, "name": f"Film {i} (20{i % 25:02d})", "stream_type": "movie",
+                "stream_id": 100000 + i, "stream_icon": f"http://img.example/{i}.jpg",
+                "rating": "7.1", "rating_5based": 3.6, "added": "1700000000",
+                "category_id": str(i % 300), "container_extension": "mkv",
+                "custom_sid": "", "direct_source": "",
+            }, f)
+        f.write("]")
+
+
+def run_mode(mode, url):
+    """Laadt de lijst op één manier via een StrmEngine (lege config) en print tijd en piek-RSS als JSON."""
+    import strm_core
+    workdir = tempfile.mkdtemp(prefix="strm_bench_")
+    engine = strm_core.StrmEngine(os.path.join(workdir, "config.json"), log=lambda message: None)
+    try:
+        start = time.perf_counter()
+        raw = engine._api_get(url, {}) if mode == "full" else engine._api_stream(url, {})
+        catalog = engine._ingest_streams("movies", raw, "http://provider", "user", "pass")
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps({"mode": mode, "items": len(catalog), "seconds": elapsed, "peak_rss_mb": peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200000)
+    parser.add_argument("--mode", choices=["full", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        return run_mode(args.mode, args.url)
+
+    workdir = tempfile.mkdtemp(prefix="strm_bench_")
+    payload = os.path.join(workdir, "get_vod_streams.json")
+    write_payload(payload, args.items)
+    size_mb = os.path.getsize(payload) / (1024 * 1024)
+
+    handler = partial(QuietHandler, directory=workdir)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/get_vod_streams.json"
+
+    print(f"Payload: {args.items} films, {size_mb:.1f} MB")
+    print(f"{'modus':<8}{'tijd (s)':>10}{'piek RSS (MB)':>16}")
+    try:
+        for mode in ("full", "stream"):
+            out = subprocess.run([sys.executable, __file__, "--mode", mode, "--url", url],
+                                 capture_output=True, text=True, check=True)
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            rss = result["peak_rss_mb"]
+            rss_text = f"{rss:.1f}" if rss is not None else "n/a"
+            print(f"{mode:<8}{result['seconds']:>10.2f}{rss_text:>16}")
+    finally:
+        httpd.shutdown()
+        os.remove(payload)
+        os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    main()
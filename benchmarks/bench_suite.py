@@ -0,0 +1,159 @@
+"""Benchmark: laden en exporteren (live, films, series) tegen een lokale nep-provider op meerdere schalen.
+
+Per schaal draait een apart subprocess met een verse StrmEngine (lege caches), zodat
+tijd en piek-RSS per schaal zuiver zijn. Resultaten worden toegevoegd aan een
+JSON-lines bestand; bij elke run wordt vergeleken met de vorige run met dezelfde
+instellingen, zodat regressies direct opvallen.
+
+Gebruik:
+    py benchmarks/bench_suite.py --scales 1000,10000,100000 --latency 0.01
+    py benchmarks/bench_suite.py --scales 10000 --error-rate 0.02 --results mijn_resultaten.jsonl
+Een schaal N betekent N films, N/4 live kanalen en N/20 series.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+from bench_ingest import peak_rss_mb
+from fake_provider import CatalogSpec, FakeProvider
+
+PHASES = ("load", "live", "movies", "series")
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, "results.jsonl")
+
+
+def count_files(path):
+    return sum(len(files) for _, _, files in os.walk(path))
+
+
+def run_child(url, workdir):
+    """Draait alle fases in dit proces en print de metingen als JSON."""
+    import strm_core
+    strm_core.TMDB_API_URL = f"{url}/3"
+    engine = strm_core.StrmEngine(os.path.join(workdir, "config.json"), log=lambda message: None)
+    engine.providers = [{"name": "bench", "server": url, "username": "bench", "password": "bench"}]
+    engine.current_provider = "bench"
+    engine.tmdb_api_key = "bench"
+    out_dir = os.path.join(workdir, "out")
+    results = {}
+
+    def measure(phase, func, items, output=None):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        files = count_files(output) if output and os.path.isdir(output) else None
+        results[phase] = {"seconds": seconds, "items": items(), "files": files, "peak_rss_mb": peak_rss_mb()}
+
+    measure("load", engine.load_from_xtream,
+            lambda: len(engine.streams_live) + len(engine.streams_movies) + len(engine.streams_series))
+    engine.selected_live = set(engine.streams_live.groups)
+    engine.selected_movies = set(engine.streams_movies.groups)
+    engine.selected_series = set(engine.streams_series.groups)
+    os.makedirs(out_dir, exist_ok=True)
+    measure("live", lambda: engine.export_live_logic(os.path.join(out_dir, "live.m3u")), lambda: len(engine.streams_live))
+    measure("movies", lambda: engine.export_movies_logic(os.path.join(out_dir, "Movies")),
+            lambda: len(engine.streams_movies), os.path.join(out_dir, "Movies"))
+    measure("series", lambda: engine.export_series_logic(os.path.join(out_dir, "Series")),
+            lambda: len(engine.streams_series), os.path.join(out_dir, "Series"))
+    engine.close()
+    print(json.dumps(results))
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(path):
+    """Leest eerdere resultaten; kapotte regels worden overgeslagen."""
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def find_baseline(records, spec):
+    """Laatste eerdere meting met exact dezelfde nep-provider instellingen."""
+    for record in reversed(records):
+        if record.get("spec") == spec:
+            return record
+    return None
+
+
+def format_delta(now, before):
+    if not before:
+        return ""
+    change = (now - before) / before * 100
+    return f"{change:+.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1000,10000", help="komma-gescheiden aantallen films")
+    parser.add_argument("--episodes", type=int, default=10, help="afleveringen per serie")
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0, help="vertraging per request in seconden")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="kans op HTTP 500 per request (0..1)")
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSON-lines bestand voor de resultaten")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.url, args.workdir)
+
+    previous = load_previous(args.results)
+    commit = git_commit()
+    print(f"{'schaal':>8} {'fase':<7}{'tijd (s)':>10}{'items/s':>12}{'bestanden/s':>13}{'piek RSS (MB)':>15}{'vs vorige':>11}")
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        spec = CatalogSpec(live=scale // 4, movies=scale, series=max(1, scale // 20), categories=args.categories,
+                           episodes=args.episodes, latency=args.latency, error_rate=args.error_rate)
+        provider = FakeProvider(spec).start()
+        workdir = tempfile.mkdtemp(prefix="strm_bench_")
+        try:
+            out = subprocess.run([sys.executable, __file__, "--child", "--url", provider.url, "--workdir", workdir],
+                                 capture_output=True, text=True, check=True)
+            phases = json.loads(out.stdout.strip().splitlines()[-1])
+        finally:
+            provider.stop()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        baseline = find_baseline(previous, spec.as_dict())
+        for phase in PHASES:
+            m = phases[phase]
+            rate = m["items"] / m["seconds"] if m["seconds"] else 0
+            files_rate = f"{m['files'] / m['seconds']:.0f}" if m["files"] and m["seconds"] else "-"
+            rss = f"{m['peak_rss_mb']:.1f}" if m["peak_rss_mb"] is not None else "n/a"
+            before = baseline["phases"][phase]["seconds"] if baseline else None
+            print(f"{scale:>8} {phase:<7}{m['seconds']:>10.2f}{rate:>12.0f}{files_rate:>13}{rss:>15}{format_delta(m['seconds'], before):>11}")
+
+        record = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+                  "platform": platform.platform(), "scale": scale, "spec": spec.as_dict(),
+                  "requests": provider.requests, "injected_errors": provider.errors, "phases": phases}
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        previous.append(record)
+    print(f"Resultaten toegevoegd aan {args.results}")
+
+
+if __name__ == "__main__":
+    main()
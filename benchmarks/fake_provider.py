@@ -0,0 +1,189 @@
+"""Lokale nep-provider (Xtream Codes player_api.php + de gebruikte TMDB endpoints) voor benchmarks.
+
+Grootte van de catalogus, vertraging per request en foutpercentage zijn instelbaar,
+zodat laden en exporteren zonder echt provider-account gemeten kunnen worden.
+
+Los starten (bv. om de GUI tegen een grote catalogus te testen):
+    py benchmarks/fake_provider.py --port 8080 --movies 100000 --latency 0.05
+Gebruik dan als server http://127.0.0.1:8080 met willekeurige gebruikersnaam en wachtwoord.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class CatalogSpec:
+    """Beschrijft de omvang en het gedrag van de nep-provider."""
+    def __init__(self, live=1000, movies=5000, series=250, categories=50, episodes=20,
+                 latency=0.0, error_rate=0.0, seed=1):
+        self.live = live
+        self.movies = movies
+        self.series = series
+        self.categories = categories
+        self.episodes = episodes      # Afleveringen per serie (verdeeld over seizoenen van 10)
+        self.latency = latency        # Seconden vertraging per request
+        self.error_rate = error_rate  # Kans (0..1) op een HTTP 500 per request
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class FakeProvider:
+    """Genereert de responses één keer (per endpoint) en serveert ze via een threaded HTTP-server."""
+    def __init__(self, spec, host="127.0.0.1", port=0):
+        self.spec = spec
+        self.requests = 0
+        self.errors = 0
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(spec.seed)
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # --- Data ---
+    def _categories(self):
+        return [{"category_id": str(i), "category_name": f"Categorie {i:03d}", "parent_id": 0}
+                for i in range(self.spec.categories)]
+
+    def _live_streams(self):
+        cats = self.spec.categories
+        return [{"num": i + 1, "name": f"Kanaal {i}", "stream_type": "live", "stream_id": i + 1,
+                 "stream_icon": f"http://img.example/live/{i}.png", "epg_channel_id": f"kanaal{i}.nl",
+                 "added": "1700000000", "category_id": str(i % cats), "tv_archive": 0}
+                for i in range(self.spec.live)]
+
+    def _vod_streams(self):
+        cats = self.spec.categories
+        return [{"num": i + 1, "name": f"Film {i} ({1980 + i % 45})", "stream_type": "movie",
+                 "stream_id": 100000 + i, "stream_icon": f"http://img.example/vod/{i}.jpg",
+                 "rating": "7.1", "rating_5based": 3.6, "added": str(1700000000 + i),
+                 "category_id": str(i % cats), "container_extension": "mkv", "custom_sid": "", "direct_source": ""}
+                for i in range(self.spec.movies)]
+
+    def _series(self):
+        cats = self.spec.categories
+        return [{"num": i + 1, "name": f"Serie {i} ({1990 + i % 35})", "series_id": 500000 + i,
+                 "cover": f"http://img.example/series/{i}.jpg", "plot": "Een serie.", "genre": "Drama",
+                 "rating": "8", "last_modified": str(1700000000 + i), "category_id": str(i % cats)}
+                for i in range(self.spec.series)]
+
+    def _series_info(self, series_id):
+        episodes = {}
+        for n in range(self.spec.episodes):
+            season = str(n // 10 + 1)
+            episodes.setdefault(season, []).append({
+                "id": f"{series_id}{n:04d}", "episode_num": n % 10 + 1, "title": f"Aflevering {n % 10 + 1}",
+                "container_extension": "mp4", "info": {"plot": "Iets gebeurt.", "movie_image": ""},
+            })
+        return {"info": {"name": f"Serie {series_id}", "plot": "Een serie.", "genre": "Drama", "rating": "8", "cover": ""},
+                "episodes": episodes}
+
+    def _cached_body(self, key, build):
+        """Grote lijsten worden één keer gegenereerd en als bytes bewaard."""
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is None:
+                body = self._bodies[key] = json.dumps(build()).encode("utf-8")
+        return body
+
+    def body_for(self, path, query):
+        """Geeft (status, bytes) voor een request-pad en querystring-dict."""
+        if path.endswith("player_api.php"):
+            action = query.get("action")
+            builders = {
+                "get_live_categories": self._categories, "get_vod_categories": self._categories,
+                "get_series_categories": self._categories, "get_live_streams": self._live_streams,
+                "get_vod_streams": self._vod_streams, "get_series": self._series,
+            }
+            if action in builders:
+                return 200, self._cached_body(action, builders[action])
+            if action == "get_series_info":
+                return 200, json.dumps(self._series_info(query.get("series_id", "0"))).encode("utf-8")
+            return 200, b"[]"
+        if path.endswith("/search/tv"):
+            show_id = zlib.crc32(query.get("query", "").encode("utf-8")) % 1000000
+            return 200, json.dumps({"page": 1, "results": [{"id": show_id, "name": query.get("query", "")}]}).encode("utf-8")
+        if "/tv/" in path:
+            show_id = path.rsplit("/", 1)[-1]
+            return 200, json.dumps({"id": show_id, "name": f"Show {show_id}", "overview": "Overzicht.",
+                                    "first_air_date": "2001-01-01", "vote_average": 7.5}).encode("utf-8")
+        return 404, b'{"success": false, "status_code": 34}'
+
+    def _handler_class(self):
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                with provider._lock:
+                    provider.requests += 1
+                    fail = provider._random.random() < provider.spec.error_rate
+                    if fail: provider.errors += 1
+                if provider.spec.latency:
+                    time.sleep(provider.spec.latency)
+                status, body = (500, b'{"error": "fake failure"}') if fail else provider.body_for(parts.path, query)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def add_spec_arguments(parser):
+    """Voegt de CatalogSpec-opties toe aan een argparse-parser."""
+    defaults = CatalogSpec()
+    parser.add_argument("--live", type=int, default=defaults.live)
+    parser.add_argument("--movies", type=int, default=defaults.movies)
+    parser.add_argument("--series", type=int, default=defaults.series)
+    parser.add_argument("--categories", type=int, default=defaults.categories)
+    parser.add_argument("--episodes", type=int, default=defaults.episodes, help="afleveringen per serie")
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="vertraging per request in seconden")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="kans op HTTP 500 per request (0..1)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    spec = CatalogSpec(args.live, args.movies, args.series, args.categories, args.episodes, args.latency, args.error_rate)
+    provider = FakeProvider(spec, args.host, args.port)
+    print(f"Nep-provider op {provider.url} (TMDB: {provider.url}/3) - Ctrl+C om te stoppen")
+    try:
+        provider.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        provider.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2978 @@
+"""Kern van STRM Manager zonder GUI: laden, cachen en exporteren van Xtream Codes catalogi."""
+# pylint: disable=too-many-instance-attributes, too-many-locals, too-many-arguments
+# pylint: disable=broad-exception-caught, line-too-long, unspecified-encoding
+import argparse
+import bisect
+import functools
+import re
+import os
+import sys
+import json
+import codecs
+import gzip
+import hashlib
+import sqlite3
+import time
+import zlib
+from contextlib import closing, contextmanager
+import threading
+import heapq
+import queue
+from collections import deque
+from array import array
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import parse_qs, urlsplit
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, quoteattr
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import base64
+
+# Probeer Windows encryptie te laden voor veilige wachtwoordopslag
+try:
+    import win32crypt
+    WIN_CRYPTO_AVAILABLE = True
+except ImportError:
+    WIN_CRYPTO_AVAILABLE = False
+
+# We doen ons voor als een browser om blokkades te voorkomen
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+# config.json staat naast de scripts
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+# Standaardwaarden voor de parallelle series-export (aanpasbaar via config.json)
+DEFAULT_SERIES_WORKERS = 8
+DEFAULT_MAX_PER_HOST = 8 # Bovengrens; de werkelijke grens per host past zich aan (zie AdaptiveLimiter)
+
+# Adaptieve grens per host (AIMD) en circuit breaker
+AIMD_START_LIMIT = 2 # Gelijktijdige requests waarmee een host begint
+LATENCY_TOLERANCE = 2.0 # Latency boven dit veelvoud van de basislijn telt als overbelasting: niet verder opschalen
+BREAKER_THRESHOLD = 5 # Fouten op rij waarna de circuit breaker opengaat
+BREAKER_COOLDOWN = 5.0 # Seconden pauze na openen; verdubbelt bij elke mislukte proef
+BREAKER_MAX_COOLDOWN = 60.0
+DEFAULT_BREAKER_GIVE_UP = 300.0 # Na zoveel seconden storing falen requests direct in plaats van te wachten
+
+# Standaardwaarden voor de gedeelde HTTP-sessie (aanpasbaar via config.json)
+DEFAULT_HTTP_POOL_SIZE = 10
+DEFAULT_HTTP_RETRIES = 3
+
+
+def create_http_session(pool_size=DEFAULT_HTTP_POOL_SIZE, retries=DEFAULT_HTTP_RETRIES):
+    """Maakt een gedeelde HTTP-sessie met keep-alive verbindingspools per host en retries voor GET."""
+    # Alleen GET wordt herhaald (idempotent); Retry-After van de server wordt gerespecteerd
+    retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=0.5,
+                  status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset({"GET"}),
+                  respect_retry_after_header=True, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SECRET_PARAM = re.compile(r'((?:password|api_key)=)[^&\s\'"]+')
+
+
+def describe_error(error):
+    """Tekst van een providerfout voor het log en foutmeldingen, zonder wachtwoord of API-key.
+
+    De meldingen van requests bevatten de volledige URL met de inloggegevens; een HTTP-fout
+    wordt daarom alleen als statuscode beschreven.
+    """
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"HTTP {error.response.status_code}"
+    return SECRET_PARAM.sub(r'\1***', str(error))
+
+
+def response_problem(response):
+    """Geeft waarom een provider-response onbruikbaar is ('HTTP 503', 'lege body', 'HTML-pagina'), of None.
+
+    Overbelaste Xtream-panels antwoorden vaak met 429/5xx, een lege body of een HTML-foutpagina
+    (soms met status 200). Dat zijn fouten, geen lege antwoorden. Andere 4xx-statussen vallen
+    hier niet onder: de server werkt dan gewoon, alleen het request niet.
+    """
+    if response.status_code == 429 or response.status_code >= 500:
+        return f"HTTP {response.status_code}"
+    body = response.content.lstrip()
+    if not body:
+        return "lege body"
+    if body[:1] == b"<" or "html" in response.headers.get("Content-Type", "").lower():
+        return "HTML-pagina"
+    return None
+
+
+def response_retried(response):
+    """True als urllib3 dit request al herhaald heeft (na een 429/5xx of time-out): de host raakt overbelast."""
+    retries = getattr(response.raw, "retries", None)
+    return bool(retries and retries.history)
+
+# Catalogus-cache: hoe lang (seconden) een endpoint-response als vers geldt (aanpasbaar via config.json)
+DEFAULT_CACHE_TTL = {
+    "get_live_categories": 24 * 3600,
+    "get_vod_categories": 24 * 3600,
+    "get_series_categories": 24 * 3600,
+    "get_live_streams": 6 * 3600,
+    "get_vod_streams": 6 * 3600,
+    "get_series": 6 * 3600,
+}
+
+# Alleen deze velden per endpoint worden in de cache bewaard
+CACHE_FIELDS = {
+    "get_live_categories": ("category_id", "category_name"),
+    "get_vod_categories": ("category_id", "category_name"),
+    "get_series_categories": ("category_id", "category_name"),
+    "get_live_streams": ("name", "category_id", "stream_id", "stream_icon", "epg_channel_id"),
+    "get_vod_streams": ("name", "category_id", "stream_id", "container_extension", "added"),
+    "get_series": ("name", "category_id", "series_id", "cover", "plot", "last_modified"),
+}
+
+# TMDB: taal van de metadata, cacheduur (positief/negatief) en maximaal aantal requests per seconde
+TMDB_API_URL = "https://api.themoviedb.org/3"
+TMDB_LANGUAGE = "nl-NL"
+DEFAULT_TMDB_CACHE_TTL = 30 * 24 * 3600
+DEFAULT_TMDB_NEGATIVE_TTL = 7 * 24 * 3600
+DEFAULT_TMDB_RATE = 40 # TMDB staat rond de 50 requests per seconde per IP toe
+
+# Grootte van de stukken waarin grote API-responses binnen worden gelezen
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Aantal achtergrondthreads dat STRM/NFO-bestanden schrijft (aanpasbaar via config.json)
+DEFAULT_IO_WORKERS = 8
+
+# Metrics: grenzen (seconden) van de latency-histogrammen en hoeveel trage requests bewaard worden
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SLOWEST_REQUESTS = 20
+MAX_LOGGED_COLLISIONS = 20 # Meer botsingen worden alleen geteld
+PROGRESS_PRINT_INTERVAL = 5.0 # Seconden tussen voortgangsregels in de CLI
+SEARCH_LIMIT = 200 # Maximaal aantal resultaten van één zoekopdracht op titel
+SEARCH_MIN_SIMILARITY = 0.4 # Minimale trigram-overeenkomst (Dice) voor een fuzzy match op een woord
+TITLE_WORD = re.compile(r'[^\W_]+')
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """Parseert een JSON-array stapsgewijs uit byte-chunks en levert elk element op zodra het compleet is."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    chunks = iter(chunks)
+    buf, pos, started, eof = "", 0, False, False
+    while True:
+        # Sla witruimte (en na de openingshaak ook komma's) over
+        skip = " \t\r\n\ufeff" if not started else " \t\r\n,"
+        while pos < len(buf) and buf[pos] in skip:
+            pos += 1
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("Response is geen JSON-array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof: raise
+            else:
+                # Een getal als "-1." kan nog doorlopen in de volgende chunk: accepteer het
+                # element pas als er een scheidingsteken achter staat (of de stream klaar is)
+                if end < len(buf) and buf[end] in " \t\r\n,]" or eof:
+                    pos = end
+                    yield item
+                    continue
+        if eof:
+            if not started: return # Lege response
+            raise ValueError("Onvolledige JSON-array")
+        chunk = next(chunks, None)
+        if chunk is None:
+            buf = buf[pos:] + text_decoder.decode(b"", final=True)
+            eof = True
+        else:
+            buf = buf[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+
+# M3U: attributen in #EXTINF-regels, Xtream-achtige stream-paden en afleveringsnummers in titels
+M3U_ATTRIBUTE = re.compile(r'([\w-]+)="([^"]*)"')
+XTREAM_STREAM_PATH = re.compile(r'^/(?:(?:live|movie|series)/)?([^/]+)/([^/]+)/(\d+)(?:\.(\w+))?$')
+EPISODE_TITLE = re.compile(r'^(?P<show>.*?)[\s._-]*S(?P<season>\d{1,2})[\s._-]*E(?P<episode>\d{1,4})\b', re.IGNORECASE)
+VOD_EXTENSIONS = (".mp4", ".mkv", ".avi", ".mov", ".m4v", ".wmv")
+
+
+def iter_m3u(chunks, encoding="utf-8"):
+    """Leest een (extended) M3U-playlist uit een stroom bytes-chunks, regel voor regel.
+
+    Levert per entry een dict met 'name', 'url' en de attributen uit #EXTINF (tvg-id,
+    tvg-logo, group-title, ...). Alleen de huidige regel staat in het geheugen.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    info = None
+    buf = ""
+
+    def lines():
+        nonlocal buf
+        for chunk in chunks:
+            buf += decoder.decode(chunk)
+            *complete, buf = buf.split("\n")
+            yield from complete
+        buf += decoder.decode(b"", final=True)
+        if buf: yield buf
+
+    first = True
+    for line in lines():
+        line = line.strip().lstrip("\ufeff")
+        if not line:
+            continue
+        if first and line.startswith("<"): # Een HTML-foutpagina, niet als entries lezen
+            raise ValueError("Response is geen M3U-playlist")
+        first = False
+        if line.startswith("#EXTINF"):
+            info, end = {}, 0
+            for m in M3U_ATTRIBUTE.finditer(line):
+                info[m.group(1).lower()] = m.group(2)
+                end = m.end()
+            comma = line.find(",", end)
+            info["name"] = line[comma + 1:].strip() if comma >= 0 else info.get("tvg-name", "")
+        elif line.startswith("#EXTGRP:"):
+            if info is not None: info.setdefault("group-title", line[8:].strip())
+        elif not line.startswith("#"):
+            entry = info if info is not None else {"name": line.rsplit("/", 1)[-1]}
+            entry["url"] = line
+            info = None
+            yield entry
+
+
+def classify_m3u_url(url):
+    """Bepaalt aan de hand van het URL-pad of een M3U-entry 'live', 'movies' of 'series' is."""
+    path = urlsplit(url).path.lower()
+    if "/movie/" in path: return "movies"
+    if "/series/" in path: return "series"
+    if path.endswith(VOD_EXTENSIONS): return "movies"
+    return "live"
+
+
+def iter_xmltv(chunks, channel_ids):
+    """Filtert een XMLTV-gids uit een stroom bytes-chunks op kanaal-id (casefold).
+
+    Levert eerst ("tv", openingstag) en daarna (tag, xml) voor elk <channel>/<programme>
+    van een gevraagd kanaal. Verwerkte elementen worden direct uit de boom gehaald,
+    zodat het geheugengebruik niet met de grootte van de gids meegroeit.
+    """
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    root, depth = None, 0
+
+    def events():
+        nonlocal root, depth
+        for event, elem in parser.read_events():
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = elem
+                    yield "tv", "<tv" + "".join(f" {k}={quoteattr(v)}" for k, v in elem.attrib.items()) + ">"
+                continue
+            depth -= 1
+            if depth != 1: continue # Alleen directe kinderen van <tv>
+            key = elem.get("id") if elem.tag == "channel" else elem.get("channel")
+            if key and key.casefold() in channel_ids:
+                elem.tail = None
+                yield elem.tag, ElementTree.tostring(elem, encoding="unicode")
+            root.remove(elem)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from events()
+    parser.close()
+    yield from events()
+
+
+class StreamCatalog:
+    """Compacte, kolomgewijze opslag van één soort streams ('live', 'movie' of 'series').
+
+    Groepsnamen en extensies worden geïnterneerd, ids staan in een array en de
+    stream-URL wordt pas opgebouwd uit de providergegevens als een export erom vraagt.
+    Een samengevoegde catalogus (zie merge_catalogs) heeft meerdere bronnen; per rij
+    staat dan welke provider de voorkeur heeft en welke andere hem ook aanbieden, en
+    een rij kan dan ook in de groepen van die andere providers staan.
+    """
+    def __init__(self, kind, server="", username="", password="", extra_fields=()):
+        self.kind = kind
+        self.sources = [(server.rstrip('/'), username, password)] # Op volgorde van prioriteit
+        self.source_col = array('B')
+        self._alternates = {} # Rij-index -> [(bron, stream_id, ext)] bij andere providers
+        self._direct_urls = {} # Rij-index -> volledige URL (M3U-entries die niet in het Xtream-patroon passen)
+        self.local_episodes = {} # row_key -> afleveringen, voor series uit een M3U-playlist (zonder get_series_info)
+        self.groups = [] # Geïnterneerde groepsnamen, index = groeps-id
+        self._group_ids = {}
+        self._exts = []
+        self._ext_ids = {}
+        self.names = []
+        self.group_col = array('I')
+        self.id_col = array('q')
+        self.ext_col = array('H')
+        self.extra = {field: [] for field in extra_fields}
+        self._odd_ids = {} # Niet-numerieke ids (zeldzaam), per rij-index
+        self._members = [] # Groepsindex: per groeps-id de oplopende rij-indexen
+        self._extra_groups = {} # Rij-index -> groeps-id's naast die in group_col (samengevoegde titels)
+        self.complete = True # False als een endpoint van de load mislukte en er ook geen cache was
+
+    def intern_group(self, name):
+        """Geeft het groeps-id voor een naam en registreert de naam als die nog onbekend is."""
+        gid = self._group_ids.get(name)
+        if gid is None:
+            gid = self._group_ids[name] = len(self.groups)
+            self.groups.append(name)
+            self._members.append(array('I'))
+        return gid
+
+    def relabel_groups(self, names, default):
+        """Vervangt voorlopige groepssleutels (bv. category_id's) door namen; gelijke namen worden samengevoegd.
+
+        names is een dict sleutel -> naam; alle namen daaruit worden als groep geregistreerd,
+        ook als er (nog) geen streams in zitten. Onbekende sleutels krijgen de naam default.
+        """
+        old_members = self._members
+        old_keys = self.groups
+        self.groups, self._group_ids, self._members = [], {}, []
+        for name in names.values(): self.intern_group(name)
+        translate = array('I', (self.intern_group(names.get(key, default)) for key in old_keys))
+        self.group_col = array('I', (translate[gid] for gid in self.group_col))
+        for old_gid, members in enumerate(old_members):
+            target = translate[old_gid]
+            if self._members[target]:
+                self._members[target] = array('I', heapq.merge(self._members[target], members))
+            else:
+                self._members[target] = members
+
+    def _intern_ext(self, ext):
+        eid = self._ext_ids.get(ext)
+        if eid is None:
+            eid = self._ext_ids[ext] = len(self._exts)
+            self._exts.append(ext)
+        return eid
+
+    def append(self, name, group, stream_id, ext="", source=0, url=None, **extra):
+        """Voegt een stream toe; extra velden moeten bij de catalogus zijn opgegeven.
+
+        url is alleen nodig als de stream-URL niet uit de providergegevens is op te bouwen.
+        """
+        index = len(self.names)
+        self.names.append(name)
+        if url: self._direct_urls[index] = url
+        self.source_col.append(source)
+        gid = self.intern_group(group)
+        self.group_col.append(gid)
+        self._members[gid].append(index)
+        try:
+            self.id_col.append(int(stream_id))
+        except (TypeError, ValueError):
+            self.id_col.append(-1)
+            self._odd_ids[index] = stream_id
+        self.ext_col.append(self._intern_ext(ext))
+        for field, column in self.extra.items():
+            column.append(extra.get(field, ''))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        return StreamRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.names)):
+            yield StreamRow(self, index)
+
+    def group_count(self, name):
+        """Aantal streams in een groep, direct uit de groepsindex."""
+        gid = self._group_ids.get(name)
+        return len(self._members[gid]) if gid is not None else 0
+
+    def in_groups(self, names):
+        """Levert alleen de rijen van de opgegeven groepen, in de oorspronkelijke volgorde van de provider."""
+        names = list(names) # Momentopname: de GUI kan de selectie-set intussen aanpassen
+        member_lists = [self._members[self._group_ids[n]] for n in names if n in self._group_ids]
+        previous = None
+        for index in heapq.merge(*member_lists):
+            if index != previous: # Een rij in meerdere gekozen groepen maar één keer
+                yield StreamRow(self, index)
+            previous = index
+
+    def in_selection(self, names, keys=()):
+        """Zoals in_groups, plus losse titels waarvan de row_key in keys staat (per titel geselecteerd)."""
+        if not keys:
+            yield from self.in_groups(names)
+            return
+        gids = {self._group_ids[n] for n in names if n in self._group_ids}
+        extra = self._extra_groups
+        for index, gid in enumerate(self.group_col):
+            if gid in gids or (extra and not gids.isdisjoint(extra.get(index, ()))) or self.row_key(index) in keys:
+                yield StreamRow(self, index)
+
+    def stream_id(self, index):
+        return self._odd_ids.get(index, self.id_col[index]) if self._odd_ids else self.id_col[index]
+
+    def group_name(self, index):
+        return self.groups[self.group_col[index]]
+
+    def ext(self, index):
+        return self._exts[self.ext_col[index]]
+
+    def build_url(self, source, stream_id, ext):
+        server, username, password = self.sources[source]
+        return f"{server}/{self.kind}/{username}/{password}/{stream_id}.{ext}"
+
+    def url(self, index):
+        """Bouwt de stream-URL voor één rij op uit de gegevens van de voorkeursprovider."""
+        direct = self._direct_urls.get(index) if self._direct_urls else None
+        return direct or self.build_url(self.source_col[index], self.stream_id(index), self.ext(index))
+
+    def candidates(self, index):
+        """Alle (bron, stream_id, ext) voor een rij: eerst de voorkeursprovider, dan de uitwijkmogelijkheden."""
+        return [(self.source_col[index], self.stream_id(index), self.ext(index)), *self._alternates.get(index, ())]
+
+    def add_alternate(self, index, source, stream_id, ext):
+        candidate = (source, stream_id, ext)
+        if candidate not in self.candidates(index): # Nooit de rij zelf of twee keer dezelfde stream
+            self._alternates.setdefault(index, []).append(candidate)
+
+    def add_to_group(self, index, group):
+        """Zet een bestaande rij ook in een andere groep; group_name blijft de eerste groep."""
+        gid = self.intern_group(group)
+        if gid == self.group_col[index] or gid in self._extra_groups.get(index, ()): return
+        self._extra_groups.setdefault(index, []).append(gid)
+        bisect.insort(self._members[gid], index)
+
+    def row_key(self, index):
+        """Stabiele sleutel van een rij over loads heen: server van de bron plus stream-id."""
+        return f"{self.sources[self.source_col[index]][0]}|{self.stream_id(index)}"
+
+    def local_series_info(self, source, series_id):
+        """Geeft voor een serie uit een M3U-playlist een get_series_info-achtig antwoord, anders None."""
+        episodes = self.local_episodes.get(f"{self.sources[source][0]}|{series_id}")
+        if episodes is None: return None
+        seasons = {}
+        for season, episode, stream_id, ext, title, url, image in episodes:
+            seasons.setdefault(str(season), []).append({"id": stream_id, "episode_num": episode, "title": title,
+                                                        "container_extension": ext, "url": url, "info": {"movie_image": image}})
+        return {"info": {}, "episodes": seasons}
+
+
+# Taal- en kwaliteitstags die providers aan titels toevoegen ('NL | ', '(NL Gesproken)', '[4K]'). Landen
+# als (US) en (UK) staan er bewust niet in: "The Office (US)" en "The Office (UK)" zijn verschillende titels.
+TITLE_TAGS = frozenset({
+    "nl", "vl", "be", "en", "de", "fr", "es", "it", "pt", "pl", "tr", "ar", "multi",
+    "gesproken", "ondertiteld", "sub", "subs", "subbed", "dub", "dubbed", "vo", "vost", "vostfr",
+    "sd", "hd", "fhd", "uhd", "4k", "hevc", "h265", "3d",
+})
+TITLE_PREFIX = re.compile(r'^\s*([A-Za-z]{2,3})\s*[|:-]\s+')
+TITLE_BRACKETS = re.compile(r'[\(\[]([^\)\]]*)[\)\]]')
+
+
+def _is_title_tag(text):
+    """True voor de inhoud van haakjes die geen deel van de titel is: een jaartal of alleen bekende tags."""
+    words = re.findall(r'[^\W_]+', text.casefold())
+    return bool(words) and (re.fullmatch(r'\d{4}', text.strip()) is not None or all(w in TITLE_TAGS for w in words))
+
+
+def normalize_title(name):
+    """Geeft (titel, jaar) zonder bekende taal- en kwaliteitstags, leestekens en hoofdletters."""
+    year = re.search(r'[\(\[](\d{4})[\)\]]', name)
+    prefix = TITLE_PREFIX.match(name)
+    title = name[prefix.end():] if prefix and prefix.group(1).casefold() in TITLE_TAGS else name
+    title = TITLE_BRACKETS.sub(lambda m: ' ' if _is_title_tag(m.group(1)) else m.group(0), title)
+    title = re.sub(r'[\W_]+', ' ', title.casefold())
+    return " ".join(title.split()), year.group(1) if year else ""
+
+
+def merge_catalogs(catalogs):
+    """Voegt catalogi van meerdere providers (op volgorde van prioriteit) samen tot één catalogus.
+
+    Dubbele titels van verschillende providers worden herkend via een hash-index op
+    genormaliseerde titel, jaar en epg_channel_id; ze houden de bron van de eerste provider,
+    onthouden de andere als uitwijkmogelijkheid en staan ook in de groep van elke provider.
+    Dubbele titels binnen één provider (in meerdere categorieën) blijven aparte rijen.
+    Geeft (catalogus, aantal duplicaten).
+    """
+    first = catalogs[0]
+    merged = StreamCatalog(first.kind, extra_fields=tuple(first.extra))
+    merged.sources = []
+    seen = {} # Sleutel -> rij-indexen van eerdere providers
+    duplicates = 0
+    for catalog in catalogs:
+        offset = len(merged.sources)
+        merged.sources.extend(catalog.sources)
+        merged.local_episodes.update(catalog.local_episodes)
+        epg_ids = catalog.extra.get('epg_id')
+        added = {} # Pas na deze provider in seen, zodat hij niet met zichzelf wordt samengevoegd
+        for index, name in enumerate(catalog.names):
+            title, year = normalize_title(name)
+            key = (title, year, (epg_ids[index] or "").casefold() if epg_ids else "")
+            source = offset + catalog.source_col[index]
+            group = catalog.group_name(index)
+            matches = seen.get(key)
+            if matches:
+                existing = next((row for row in matches if merged.group_name(row) == group), matches[0])
+                merged.add_alternate(existing, source, catalog.stream_id(index), catalog.ext(index))
+                merged.add_to_group(existing, group)
+                duplicates += 1
+                continue
+            added.setdefault(key, []).append(len(merged))
+            merged.append(name, group, catalog.stream_id(index), catalog.ext(index), source,
+                          catalog._direct_urls.get(index), **{field: column[index] for field, column in catalog.extra.items()})
+        for key, rows in added.items():
+            seen.setdefault(key, []).extend(rows)
+    merged.complete = all(catalog.complete for catalog in catalogs)
+    return merged, duplicates
+
+
+def word_trigrams(word):
+    """Trigrammen van een woord; de opvulling laat het begin van het woord zwaarder meetellen."""
+    text = f"  {word} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TitleIndex:
+    """Zoekindex over de titels van één catalogus.
+
+    Een omgekeerde index van woord naar rij-indexen, plus een trigramindex over de
+    woordenlijst zelf (die veel kleiner is dan de catalogus). Een zoekwoord matcht exact,
+    als prefix (tijdens het typen) of fuzzy via trigrammen; een titel moet op elk
+    zoekwoord matchen. Zo blijft zoeken ook bij 200k+ titels binnen milliseconden.
+    """
+    def __init__(self, catalog):
+        self.catalog = catalog
+        postings = {}
+        for index, name in enumerate(catalog.names):
+            for word in set(TITLE_WORD.findall(name.casefold())):
+                rows = postings.get(word)
+                if rows is None: rows = postings[word] = array('I')
+                rows.append(index)
+        self.words = sorted(postings)
+        self.postings = [postings[word] for word in self.words]
+        self._grams = {}
+        self._gram_counts = array('H')
+        for word_id, word in enumerate(self.words):
+            if word.isdigit(): # Jaartallen en nummers alleen exact of als prefix
+                self._gram_counts.append(0)
+                continue
+            grams = word_trigrams(word)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                ids = self._grams.get(gram)
+                if ids is None: ids = self._grams[gram] = array('I')
+                ids.append(word_id)
+
+    def _match_word(self, term):
+        """Geeft word_id -> score voor één zoekwoord: 1.0 exact, 0.9 prefix, anders de trigram-overeenkomst."""
+        matches = {}
+        start = bisect.bisect_left(self.words, term)
+        for word_id in range(start, len(self.words)):
+            if not self.words[word_id].startswith(term): break
+            matches[word_id] = 1.0 if self.words[word_id] == term else 0.9
+        if len(term) < 3 or term.isdigit():
+            return matches
+        grams = word_trigrams(term)
+        counts = {}
+        for gram in grams:
+            for word_id in self._grams.get(gram, ()):
+                counts[word_id] = counts.get(word_id, 0) + 1
+        for word_id, count in counts.items():
+            score = 2 * count / (len(grams) + self._gram_counts[word_id])
+            if score >= SEARCH_MIN_SIMILARITY and word_id not in matches:
+                matches[word_id] = 0.8 * score
+        return matches
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Geeft de beste (score, rij-index) paren voor een zoekopdracht, hoogste score eerst."""
+        terms = TITLE_WORD.findall(query.casefold())
+        scores = None
+        for term in dict.fromkeys(terms):
+            best = {}
+            # Oplopend op score, zodat een betere match van hetzelfde woord de vorige overschrijft
+            for word_id, score in sorted(self._match_word(term).items(), key=lambda item: item[1]):
+                best.update(dict.fromkeys(self.postings[word_id], score))
+            if scores is None: scores = best
+            else: scores = {index: total + best[index] for index, total in scores.items() if index in best}
+            if not scores: return []
+        if scores is None: return []
+        names, count = self.catalog.names, len(dict.fromkeys(terms))
+        # Bij gelijke score gaat de kortste titel voor (de 'echte' titel boven vervolgdelen en varianten)
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -len(names[item[0]])))
+        return [(total / count, index) for index, total in top]
+
+
+class StreamRow:
+    """Lichtgewicht weergave van één rij uit een StreamCatalog, leesbaar als een dict."""
+    __slots__ = ('catalog', 'index')
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+
+    def __getitem__(self, key):
+        catalog, index = self.catalog, self.index
+        if key == 'name': return catalog.names[index]
+        if key == 'group': return catalog.group_name(index)
+        if key in ('stream_id', 'series_id'): return catalog.stream_id(index)
+        if key == 'ext': return catalog.ext(index)
+        if key == 'url': return catalog.url(index)
+        if key == 'source': return catalog.source_col[index]
+        if key == 'candidates': return catalog.candidates(index)
+        if key in catalog.extra: return catalog.extra[key][index]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class ExportManifest:
+    """Houdt per exportmap en soort export bij welke bestanden zijn gemaakt en met welke inhoud.
+
+    Ongewijzigde bestanden worden niet opnieuw geschreven (mtime blijft gelijk, zodat
+    mediacenters niet alles opnieuw scannen) en bestanden die niet meer door de
+    provider worden aangeboden kunnen na afloop worden opgeruimd.
+    """
+    def __init__(self, base_dir, kind):
+        self.base_dir = os.path.abspath(base_dir)
+        self.path = os.path.join(self.base_dir, f".strm_manager_{kind}.json")
+        self.previous = {}
+        self.current = {}
+        self.written = 0
+        self.skipped = 0
+        self.pruned = 0
+        self._lock = threading.Lock()
+        self._sorted_previous = None # Gesorteerde paden voor keep_dir, pas gemaakt als nodig
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.previous = json.load(f).get("files", {})
+        except (OSError, ValueError, AttributeError):
+            self.previous = {}
+
+    def _rel(self, path):
+        return os.path.relpath(os.path.abspath(path), self.base_dir).replace(os.sep, "/")
+
+    @staticmethod
+    def _digest(content):
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _digest_on_disk(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls._digest(f.read())
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def write(self, path, content):
+        """Schrijft een bestand alleen als het nieuw of gewijzigd is; geeft True als er geschreven is."""
+        rel = self._rel(path)
+        digest = self._digest(content)
+        old = self.previous.get(rel)
+        if old == digest and os.path.exists(path) or old is None and self._digest_on_disk(path) == digest:
+            with self._lock:
+                self.current[rel] = digest
+                self.skipped += 1
+            return False
+        try:
+            atomic_write_text(path, content)
+        except OSError:
+            if old is not None: # Het oude bestand blijft staan, dus ook in het manifest
+                with self._lock: self.current.setdefault(rel, old)
+            raise
+        with self._lock:
+            self.current[rel] = digest
+            self.written += 1
+        return True
+
+    def adopt_dir(self, dir_path):
+        """Neemt de bestanden onder een map over zoals ze nu op schijf staan (bv. uit een onderbroken export)."""
+        self.keep_dir(dir_path)
+        for root, _, files in os.walk(dir_path):
+            for name in files:
+                if name.startswith("."): continue # Tijdelijke en eigen bestanden
+                path = os.path.join(root, name)
+                digest = self._digest_on_disk(path)
+                if digest:
+                    with self._lock: self.current.setdefault(self._rel(path), digest)
+
+    def keep_dir(self, dir_path):
+        """Markeert alle eerder gemaakte bestanden onder een map als nog geldig (bv. na een mislukte serie)."""
+        prefix = self._rel(dir_path) + "/"
+        with self._lock:
+            if self._sorted_previous is None:
+                self._sorted_previous = sorted(self.previous)
+            keys = self._sorted_previous
+            for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+                if not keys[i].startswith(prefix): break
+                self.current.setdefault(keys[i], self.previous[keys[i]])
+
+    def keep_file(self, path):
+        """Markeert één eerder gemaakt bestand als nog geldig; False als het niet in het vorige manifest staat."""
+        rel = self._rel(path)
+        digest = self.previous.get(rel)
+        if digest is None or not os.path.exists(path): return False
+        with self._lock:
+            self.current.setdefault(rel, digest)
+            self.skipped += 1
+        return True
+
+    def prune(self):
+        """Verwijdert bestanden uit een vorige export die nu niet meer zijn gemaakt, plus lege mappen."""
+        for rel in set(self.previous) - set(self.current):
+            path = os.path.normpath(os.path.join(self.base_dir, rel))
+            if os.path.commonpath([path, self.base_dir]) != self.base_dir:
+                continue # Nooit buiten de exportmap verwijderen
+            try:
+                os.remove(path)
+                self.pruned += 1
+            except FileNotFoundError:
+                continue
+            except OSError:
+                self.current[rel] = self.previous[rel] # Bewaar zodat we het later opnieuw proberen
+                continue
+            parent = os.path.dirname(path)
+            while parent != self.base_dir and os.path.commonpath([parent, self.base_dir]) == self.base_dir:
+                try:
+                    os.rmdir(parent) # Lukt alleen als de map leeg is
+                except OSError:
+                    break
+                parent = os.path.dirname(parent)
+        return self.pruned
+
+    def save(self):
+        """Slaat het manifest atomair op naast de geëxporteerde bestanden."""
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "files": self.current}, f)
+            os.replace(tmp_path, self.path)
+        except OSError: pass
+
+
+class ExportPlan:
+    """De volledige uitvoerboom van een film- of serie-export, opgebouwd voordat er iets wordt geschreven.
+
+    Per item een map met de bestanden die erin komen (inhoud None als die pas bij het exporteren
+    bekend is). Mappen worden hoofdletterongevoelig vergeleken, zoals op Windows en SMB: een andere
+    titel die op een al geplande map uitkomt krijgt het stream-id erbij in plaats van de eerste te
+    overschrijven, een dubbele titel wordt overgeslagen. Beide worden als botsing gemeld.
+    """
+    def __init__(self, base_dir):
+        self.base_dir = os.path.abspath(base_dir)
+        self.entries = [] # (map, rij, {bestandsnaam: inhoud of None})
+        self.collisions = [] # (map, eerste titel, botsende titel, nieuwe map of None als overgeslagen)
+        self._claimed = {} # Genormaliseerde map -> titel
+
+    @staticmethod
+    def _key(directory):
+        return os.path.normpath(directory).casefold()
+
+    def add(self, directory, row, files=None):
+        """Plant een item; geeft de uiteindelijke map terug, of None als het een dubbele titel is."""
+        first = self._claimed.get(self._key(directory))
+        if first is not None:
+            if first.casefold() == row['name'].casefold():
+                self.collisions.append((directory, first, row['name'], None))
+                return None
+            new_dir = f"{directory} [{row['stream_id']}]"
+            self.collisions.append((directory, first, row['name'], new_dir))
+            directory = new_dir
+        self._claimed[self._key(directory)] = row['name']
+        self.entries.append((directory, row, files or {}))
+        return directory
+
+    def ordered(self):
+        """De items gesorteerd op map, zodat de schijf map voor map wordt beschreven."""
+        return sorted(self.entries, key=lambda entry: entry[0])
+
+    def lines(self):
+        """Het plan als relatieve paden: één regel per bestand, of per map als de inhoud nog niet bekend is."""
+        for directory, _, files in self.ordered():
+            rel = os.path.relpath(directory, self.base_dir).replace(os.sep, "/")
+            if not files: yield rel + "/"
+            for name in files: yield f"{rel}/{name}"
+
+    def summary(self, manifest):
+        """Aantallen bestanden en mappen plus de verwachte wijzigingen ten opzichte van het vorige manifest."""
+        counts = {"files": 0, "directories": 0, "new": 0, "changed": 0, "unchanged": 0, "pending": 0, "stale": 0,
+                  "collisions": len(self.collisions)}
+        planned, directories, open_dirs = set(), set(), set()
+        for directory, _, files in self.entries:
+            rel_dir = manifest._rel(directory)
+            parent = rel_dir
+            while parent and parent != "." and parent not in directories:
+                directories.add(parent)
+                parent = os.path.dirname(parent)
+            if not files:
+                open_dirs.add(rel_dir) # Inhoud volgt pas bij het exporteren (afleveringen)
+                counts["pending"] += 1
+            for name, content in files.items():
+                rel = f"{rel_dir}/{name}"
+                planned.add(rel)
+                old = manifest.previous.get(rel)
+                if content is None: counts["pending"] += 1
+                elif old is None: counts["new"] += 1
+                elif old == manifest._digest(content): counts["unchanged"] += 1
+                else: counts["changed"] += 1
+        for rel in manifest.previous:
+            if rel in planned: continue
+            parent = os.path.dirname(rel)
+            while parent and parent not in open_dirs:
+                parent = os.path.dirname(parent)
+            if not parent: counts["stale"] += 1
+        counts["files"], counts["directories"] = len(planned), len(directories)
+        return counts
+
+
+def atomic_write_text(path, content):
+    """Schrijft een tekstbestand via een tijdelijk bestand plus rename, zodat een scan nooit een half bestand ziet."""
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+
+def compute_delta(previous, current):
+    """Vergelijkt twee momentopnames (sleutel -> added/last_modified) en geeft de sets added, changed, removed en unchanged.
+
+    Items zonder tijdstempel kunnen niet vergeleken worden en tellen altijd als gewijzigd.
+    """
+    added, changed, unchanged = set(), set(), set()
+    for key, stamp in current.items():
+        if key not in previous: added.add(key)
+        elif not stamp or str(previous[key]) != str(stamp): changed.add(key)
+        else: unchanged.add(key)
+    return {"added": added, "changed": changed, "removed": set(previous) - set(current), "unchanged": unchanged}
+
+
+class SyncSnapshot:
+    """De momentopname (sleutel -> added/last_modified) van de vorige export naar een map, voor delta-syncs."""
+    def __init__(self, base_dir, kind):
+        self.path = os.path.join(os.path.abspath(base_dir), f".strm_manager_{kind}.snapshot.json")
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.items = json.load(f).get("items", {})
+        except (OSError, ValueError, AttributeError):
+            self.items = {}
+
+    def save(self, items):
+        try:
+            atomic_write_text(self.path, json.dumps({"version": 1, "saved_at": time.time(), "items": items}))
+            self.items = items
+        except OSError: pass
+
+
+class ExportJournal:
+    """Append-only logboek van een series-export, zodat een onderbroken export kan worden hervat.
+
+    Elke afgeronde serie wordt direct vastgelegd (klaar, of mislukt met de foutmelding). Na een
+    volledige run blijven alleen de mislukte series over, die apart opnieuw geprobeerd kunnen worden.
+    """
+    def __init__(self, base_dir, kind="series"):
+        self.base_dir = os.path.abspath(base_dir)
+        self.path = os.path.join(self.base_dir, f".strm_manager_{kind}.journal")
+        self.done = set()
+        self.failed = {}
+        self._file = None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        key = str(entry["id"])
+                    except (ValueError, KeyError, TypeError):
+                        continue # Half geschreven regel na een crash
+                    if entry.get("status") == "done":
+                        self.done.add(key)
+                        self.failed.pop(key, None)
+                    else:
+                        self.failed[key] = entry.get("error", "")
+                        self.done.discard(key)
+        except OSError:
+            pass
+
+    def _append(self, entry):
+        try:
+            if self._file is None:
+                os.makedirs(self.base_dir, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+        except OSError: pass # Zonder logboek werkt de export gewoon, alleen niet hervatbaar
+
+    def mark_done(self, key):
+        key = str(key)
+        self.done.add(key)
+        self.failed.pop(key, None)
+        self._append({"id": key, "status": "done"})
+
+    def mark_failed(self, key, error):
+        key = str(key)
+        self.failed[key] = str(error)
+        self.done.discard(key)
+        self._append({"id": key, "status": "failed", "error": str(error)})
+
+    def close(self, finished):
+        """Sluit het logboek; na een volledige run blijven alleen de mislukte series over (of verdwijnt het bestand)."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if not finished: return
+        self.done.clear()
+        try:
+            if self.failed:
+                atomic_write_text(self.path, "".join(json.dumps({"id": k, "status": "failed", "error": e}) + "\n"
+                                                     for k, e in self.failed.items()))
+            else:
+                os.remove(self.path)
+        except OSError: pass
+
+
+class OutputWriter:
+    """Schrijft exportbestanden op een pool van achtergrondthreads, via het manifest.
+
+    Mappen die al bestaan worden onthouden, zodat er per map maar één keer een
+    makedirs-aanroep naar (netwerk)schijf gaat. `close()` wacht tot alles geschreven is.
+    """
+    def __init__(self, manifest, workers=DEFAULT_IO_WORKERS, metrics=None):
+        self.manifest = manifest
+        self.metrics = metrics
+        self.files = 0
+        self.errors = 0
+        self._dirs = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="strm-io")
+        self._local = threading.local()
+        self._slots = threading.BoundedSemaphore(workers * 64) # Begrenst de wachtrij (geheugen)
+        self._start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def ensure_dir(self, dir_path):
+        if dir_path in self._dirs: return
+        os.makedirs(dir_path, exist_ok=True)
+        with self._lock: self._dirs.add(dir_path)
+
+    def write(self, path, content):
+        """Zet een bestand in de wachtrij; fouten worden geteld in plaats van opgegooid."""
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._write, path, content)
+        except RuntimeError: # Pool al gesloten
+            self._slots.release()
+            raise
+        pending = getattr(self._local, "pending", None)
+        if pending is not None: pending.append(future)
+
+    @contextmanager
+    def batch(self):
+        """Wacht aan het eind van het blok tot alle bestanden die deze thread erin schreef op schijf staan."""
+        pending = self._local.pending = []
+        try:
+            yield
+        finally:
+            self._local.pending = None
+            wait(pending)
+
+    def _write(self, path, content):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            self.ensure_dir(os.path.dirname(path))
+            outcome = "write" if self.manifest.write(path, content) else "unchanged"
+            with self._lock: self.files += 1
+        except OSError:
+            with self._lock: self.errors += 1
+        finally:
+            self._slots.release()
+            if self.metrics:
+                self.metrics.observe("file", outcome, time.perf_counter() - start, len(content), outcome != "error")
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.elapsed = time.perf_counter() - self._start
+
+    @property
+    def files_per_second(self):
+        return self.files / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ProgressBus:
+    """Thread-veilig kanaal voor voortgang: workers melden, één lezer haalt op een vast ritme de stand op.
+
+    Per fase wordt alleen de actuele stand bijgehouden (klaar/totaal, bytes, fouten), zodat duizenden
+    meldingen per seconde samenvallen tot één update per frame. Logberichten worden in volgorde
+    bewaard tot ze worden opgehaald, met een maximum zodat een trage lezer het geheugen niet vult.
+    """
+    def __init__(self, max_messages=1000):
+        self._lock = threading.Lock()
+        self._phases = {} # Naam -> stand; de laatst gestarte onafgeronde fase is de actuele
+        self._messages = deque(maxlen=max_messages)
+
+    def start(self, phase, total=None):
+        """Begint (of herstart) een fase; total None betekent dat het aantal nog niet bekend is."""
+        with self._lock:
+            self._phases.pop(phase, None)
+            self._phases[phase] = {"phase": phase, "done": 0, "total": total, "bytes": 0, "errors": 0,
+                                   "started": time.perf_counter(), "finished": False}
+
+    def advance(self, done=1, nbytes=0, errors=0, phase=None):
+        """Telt voortgang op bij een fase (standaard de actuele)."""
+        with self._lock:
+            state = self._phases.get(phase) if phase else self._current()
+            if state is None: return
+            state["done"] += done
+            state["bytes"] += nbytes
+            state["errors"] += errors
+
+    def finish(self, phase):
+        with self._lock:
+            if phase in self._phases: self._phases[phase]["finished"] = True
+
+    @contextmanager
+    def phase(self, name, total=None):
+        self.start(name, total)
+        try:
+            yield
+        finally:
+            self.finish(name)
+
+    def message(self, text):
+        with self._lock:
+            self._messages.append(text)
+
+    def _current(self):
+        return next((state for state in reversed(self._phases.values()) if not state["finished"]), None)
+
+    def drain(self):
+        """Geeft (nieuwe logberichten, kopie van de actuele fase of None) en leegt de berichtenlijst."""
+        with self._lock:
+            messages = list(self._messages)
+            self._messages.clear()
+            state = self._current()
+            return messages, dict(state) if state else None
+
+
+def progress_rate(state, now=None):
+    """Geeft (items per seconde, resterende seconden of None) voor een fase uit ProgressBus."""
+    elapsed = (now or time.perf_counter()) - state["started"]
+    rate = state["done"] / elapsed if elapsed > 0 else 0.0
+    remaining = (state["total"] - state["done"]) / rate if state["total"] and rate else None
+    return rate, remaining
+
+
+def format_duration(seconds):
+    """Korte leesbare duur: 45s, 3m05s of 1u02m."""
+    seconds = int(seconds)
+    if seconds < 60: return f"{seconds}s"
+    if seconds < 3600: return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}u{seconds % 3600 // 60:02d}m"
+
+
+def print_progress(bus, stop, format_state, interval=PROGRESS_PRINT_INTERVAL, out=None):
+    """Schrijft tot stop gezet is elke interval seconden de actuele fase naar out (standaard stderr)."""
+    last = None
+    while not stop.wait(interval):
+        _, state = bus.drain()
+        if state is None: continue
+        line = format_state(state)
+        if line != last: print(line, file=out or sys.stderr, flush=True)
+        last = line
+
+
+class Metrics:
+    """Verzamelt per run aantallen, bytes en latency-histogrammen per actie, plus de duur per fase.
+
+    Een actie is bv. ("api", "get_series_info"), ("tmdb", "search/tv") of ("file", "write").
+    Het rapport kan als JSON en in het Prometheus tekstformaat worden weggeschreven.
+    """
+    REQUEST_KINDS = ("api", "tmdb")
+
+    def __init__(self, keep_slowest=SLOWEST_REQUESTS):
+        self.keep_slowest = keep_slowest
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.operations = {} # (kind, name) -> tellers en histogram
+            self.phases = {}     # fase -> seconden
+            self._slowest = []   # min-heap van (seconden, volgnummer, kind, name, detail)
+            self._seq = 0
+            self.started_at = time.time()
+
+    def observe(self, kind, name, seconds, nbytes=0, ok=True, detail=""):
+        with self._lock:
+            op = self.operations.get((kind, name))
+            if op is None:
+                op = self.operations[(kind, name)] = {"count": 0, "errors": 0, "bytes": 0, "seconds_sum": 0.0,
+                                                      "seconds_max": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1)}
+            op["count"] += 1
+            op["errors"] += 0 if ok else 1
+            op["bytes"] += nbytes
+            op["seconds_sum"] += seconds
+            op["seconds_max"] = max(op["seconds_max"], seconds)
+            op["buckets"][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            if kind in self.REQUEST_KINDS and self.keep_slowest:
+                self._seq += 1
+                heapq.heappush(self._slowest, (seconds, self._seq, kind, name, detail))
+                if len(self._slowest) > self.keep_slowest:
+                    heapq.heappop(self._slowest)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def slowest(self):
+        """De traagste requests van deze run, traagste eerst."""
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        return [{"seconds": sec, "kind": kind, "name": name, "detail": detail} for sec, _, kind, name, detail in entries]
+
+    def to_dict(self):
+        with self._lock:
+            operations = []
+            for (kind, name), op in sorted(self.operations.items()):
+                cumulative, buckets = 0, {}
+                for bound, n in zip([*map(str, LATENCY_BUCKETS), "+Inf"], op["buckets"]):
+                    cumulative += n
+                    buckets[bound] = cumulative
+                operations.append({"kind": kind, "name": name, **{k: v for k, v in op.items() if k != "buckets"},
+                                   "seconds_avg": op["seconds_sum"] / op["count"], "buckets": buckets})
+            phases = dict(self.phases)
+            started_at = self.started_at
+        return {"started_at": started_at, "phases": phases, "operations": operations, "slowest": self.slowest()}
+
+    def to_prometheus(self, run):
+        """Het rapport in het Prometheus tekstformaat (bv. voor de textfile collector van node_exporter)."""
+        def labels(**kw):
+            escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            return ",".join(f'{k}="{escape(v)}"' for k, v in kw.items())
+        report = self.to_dict()
+        lines = ["# HELP strm_operation_duration_seconds Duur van requests en bestandsbewerkingen.",
+                 "# TYPE strm_operation_duration_seconds histogram"]
+        for op in report["operations"]:
+            base = labels(run=run, kind=op["kind"], name=op["name"])
+            for bound, n in op["buckets"].items():
+                lines.append(f'strm_operation_duration_seconds_bucket{{{base},le="{bound}"}} {n}')
+            lines.append(f"strm_operation_duration_seconds_sum{{{base}}} {op['seconds_sum']:.6f}")
+            lines.append(f"strm_operation_duration_seconds_count{{{base}}} {op['count']}")
+        for metric, key, help_text in (("strm_operation_bytes_total", "bytes", "Aantal ontvangen of geschreven bytes."),
+                                       ("strm_operation_errors_total", "errors", "Aantal mislukte bewerkingen.")):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [f"{metric}{{{labels(run=run, kind=op['kind'], name=op['name'])}}} {op[key]}" for op in report["operations"]]
+        lines += ["# HELP strm_phase_duration_seconds Duur per fase van de laatste run.", "# TYPE strm_phase_duration_seconds gauge"]
+        lines += [f"strm_phase_duration_seconds{{{labels(run=run, phase=name)}}} {sec:.6f}" for name, sec in sorted(report["phases"].items())]
+        lines += ["# HELP strm_run_started_timestamp_seconds Starttijd van de laatste run.", "# TYPE strm_run_started_timestamp_seconds gauge",
+                  f"strm_run_started_timestamp_seconds{{{labels(run=run)}}} {report['started_at']:.0f}"]
+        return "\n".join(lines) + "\n"
+
+
+def instrumented(run_name):
+    """Decorator voor engine-methodes: meet de hele run en schrijft daarna de metrics-rapporten."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            self.metrics.reset()
+            try:
+                with self.metrics.phase(run_name):
+                    return func(self, *args, **kwargs)
+            finally:
+                self._write_metrics(run_name)
+        return wrapper
+    return decorate
+
+
+class CatalogCache:
+    """Persistente SQLite-cache van provider-responses, per provider en per endpoint."""
+    def __init__(self, path):
+        self.path = path
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute("CREATE TABLE IF NOT EXISTS responses (provider TEXT, endpoint TEXT, fetched_at REAL, "
+                           "fields TEXT, body BLOB, PRIMARY KEY (provider, endpoint))")
+        except sqlite3.Error: pass
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def age(self, provider, endpoint, fields):
+        """Leeftijd van een entry in seconden, of None als er (voor deze velden) niets in de cache staat."""
+        try:
+            with closing(self._connect()) as db:
+                row = db.execute("SELECT fetched_at, fields FROM responses WHERE provider = ? AND endpoint = ?",
+                                 (provider, endpoint)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or row[1] != ",".join(fields):
+            return None
+        return max(0.0, time.time() - row[0])
+
+    def get(self, provider, endpoint, fields, max_age=None):
+        """Geeft de gecachte items als iterator van dicts, of None bij een miss of als de entry te oud is."""
+        try:
+            with closing(self._connect()) as db:
+                row = db.execute("SELECT fetched_at, fields, body FROM responses WHERE provider = ? AND endpoint = ?",
+                                 (provider, endpoint)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or row[1] != ",".join(fields):
+            return None
+        if max_age is not None and time.time() - row[0] > max_age:
+            return None
+        try:
+            rows = json.loads(zlib.decompress(row[2]))
+        except (zlib.error, ValueError):
+            return None
+        return ({f: v for f, v in zip(fields, values) if v is not None} for values in rows)
+
+    def put(self, provider, endpoint, fields, rows):
+        """Slaat de items (als tuples in de volgorde van fields) gecomprimeerd op."""
+        body = zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"), 6)
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                           (provider, endpoint, time.time(), ",".join(fields), body))
+        except sqlite3.Error: pass
+
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blokkeert tot er weer een request mag worden gedaan."""
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SingleFlight:
+    """Zorgt dat gelijktijdige aanvragen voor dezelfde sleutel maar één keer worden uitgevoerd."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            future = self._calls.get(key)
+            owner = future is None
+            if owner:
+                future = self._calls[key] = Future()
+        if not owner:
+            return future.result() # Wacht op de lopende aanvraag
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class ProviderUnavailable(requests.RequestException):
+    """De circuit breaker van een host staat al langer dan de opgegeven tijd open; requests falen direct."""
+
+
+class AdaptiveLimiter:
+    """Begrenst het aantal gelijktijdige requests naar één host en past die grens aan (AIMD).
+
+    Zolang requests slagen en de latency niet oploopt, komt er per ronde (limit geslaagde
+    requests) één slot bij, tot max_limit. Een fout of time-out halveert de grens, hooguit één
+    keer per latency-periode, zodat een golf gelijktijdige fouten maar één keer telt.
+    Na BREAKER_THRESHOLD fouten op rij gaat de circuit breaker open: requests wachten dan tot de
+    cooldown voorbij is, waarna één proefrequest bepaalt of de host weer bereikbaar is. Duurt de
+    storing langer dan give_up seconden, dan falen requests direct met ProviderUnavailable.
+    """
+    def __init__(self, host, max_limit, give_up=DEFAULT_BREAKER_GIVE_UP, on_event=None):
+        self.host = host
+        self.max_limit = max(1, max_limit)
+        self.limit = float(min(AIMD_START_LIMIT, self.max_limit))
+        self.give_up = give_up
+        self.on_event = on_event # Callback(event, host, **info) bij 'open', 'closed' en 'give_up'
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._failures = 0 # Fouten op rij
+        self._latency = None # Snel voortschrijdend gemiddelde (tijd tot de response-headers)
+        self._baseline = None # Traag stijgend minimum: de latency van een rustige host
+        self._last_decrease = 0.0
+        self._opened_at = None # Breaker open sinds (monotonic), anders None
+        self._open_until = 0.0
+        self._cooldown = BREAKER_COOLDOWN
+        self._probing = False
+        self._gave_up = False
+
+    def _event(self, event, **info):
+        if self.on_event: self.on_event(event, self.host, **info)
+
+    def acquire(self, check=None):
+        """Wacht op een vrij slot; check() wordt tijdens het wachten aangeroepen (bv. om te stoppen).
+
+        Geeft True als dit het proefrequest van een open breaker is.
+        """
+        gave_up = None
+        try:
+            with self._cond:
+                while True:
+                    if check: check()
+                    now = time.monotonic()
+                    if self._opened_at is None:
+                        if self._in_flight < int(self.limit):
+                            self._in_flight += 1
+                            return False
+                    elif now >= self._open_until and not self._probing:
+                        self._probing = True
+                        self._in_flight += 1
+                        return True
+                    elif now - self._opened_at >= self.give_up:
+                        if not self._gave_up: gave_up = now - self._opened_at # Eén melding per storing
+                        self._gave_up = True
+                        raise ProviderUnavailable(f"{self.host} reageert al {now - self._opened_at:.0f}s niet")
+                    # Met een timeout, zodat check() ook tijdens een lange pauze aan bod komt
+                    self._cond.wait(min(0.5, max(0.01, self._open_until - now)) if self._opened_at else 0.5)
+        finally:
+            if gave_up is not None: self._event("give_up", seconds=gave_up)
+
+    def _decrease(self, now):
+        """Halveert de grens, hooguit één keer per latency-periode."""
+        if now - self._last_decrease >= (self._latency or 0.0):
+            self.limit = max(1.0, self.limit / 2)
+            self._last_decrease = now
+
+    def release(self, ok, seconds, probe=False, congested=False, deferred=False):
+        """Geeft het slot terug. ok=True/False telt als succes of fout, None (bv. gestopt) telt niet mee.
+
+        congested betekent dat het request wel lukte, maar pas na herhalen: de grens gaat omlaag
+        zonder dat het als fout voor de circuit breaker telt. Met deferred komt de uitkomst later
+        via report(), bv. als de body van een gestreamde response gelezen is.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            event = None if deferred else self._record(ok, seconds, probe, congested)
+            self._cond.notify_all()
+        if event: self._event(event[0], **event[1])
+
+    def report(self, ok, seconds, probe=False, congested=False):
+        """Telt de uitkomst van een request waarvan het slot met deferred al is teruggegeven."""
+        with self._cond:
+            event = self._record(ok, seconds, probe, congested)
+            self._cond.notify_all()
+        if event: self._event(event[0], **event[1])
+
+    def _record(self, ok, seconds, probe, congested):
+        """Verwerkt een uitkomst in de grens en de breaker (met de lock); geeft een eventueel event."""
+        event = None
+        if probe: self._probing = False
+        now = time.monotonic()
+        if ok:
+            self._failures = 0
+            self._latency = seconds if self._latency is None else 0.8 * self._latency + 0.2 * seconds
+            self._baseline = seconds if self._baseline is None or seconds < self._baseline else self._baseline + 0.01 * (seconds - self._baseline)
+            if self._opened_at is not None: # De host antwoordt weer: voorzichtig opnieuw beginnen
+                event = ("closed", {"seconds": now - self._opened_at})
+                self._opened_at, self._cooldown, self._gave_up = None, BREAKER_COOLDOWN, False
+                self.limit = float(min(AIMD_START_LIMIT, self.max_limit))
+            elif congested:
+                self._decrease(now)
+            elif self._latency <= LATENCY_TOLERANCE * self._baseline or self._latency < 0.1:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        elif ok is False:
+            self._failures += 1
+            if probe: # Proef mislukt: langer wachten
+                self._cooldown = min(self._cooldown * 2, BREAKER_MAX_COOLDOWN)
+                self._open_until = now + self._cooldown
+            elif self._opened_at is None:
+                self._decrease(now)
+                if self._failures >= BREAKER_THRESHOLD:
+                    self._opened_at, self._open_until = now, now + self._cooldown
+                    event = ("open", {"seconds": self._cooldown})
+        return event
+
+    @contextmanager
+    def slot(self, check=None):
+        """Context manager rond één request. Zet outcome['ok'] op True of False; een requests-fout telt als False.
+
+        outcome['seconds'] is de latency voor de regeling (standaard de hele duur van het blok),
+        outcome['congested'] geeft aan dat het request pas na herhalen lukte. Met outcome['deferred']
+        (en ok nog None) wordt het slot vrijgegeven en telt de aanroeper de uitkomst later met
+        report(..., probe=outcome['probe']).
+        """
+        probe = self.acquire(check)
+        outcome = {"ok": None, "seconds": None, "congested": False, "deferred": False, "probe": probe}
+        start = time.perf_counter()
+        try:
+            yield outcome
+        except requests.RequestException:
+            if outcome["ok"] is None: outcome["ok"] = False
+            raise
+        finally:
+            if outcome["ok"] is not None: outcome["deferred"] = False # Al bekend: direct tellen
+            self.release(outcome["ok"], outcome["seconds"] if outcome["seconds"] is not None else time.perf_counter() - start, probe,
+                         outcome["congested"], outcome["deferred"])
+
+    def stats(self):
+        with self._cond:
+            return {"limit": self.limit, "in_flight": self._in_flight, "latency": self._latency,
+                    "open": self._opened_at is not None}
+
+
+class JobCancelled(Exception):
+    """Wordt opgegooid als de lopende job is gestopt; de engine controleert dit voor elke request."""
+
+
+class Job:
+    """Eén laad- of exportjob in de wachtrij van de JobScheduler."""
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+        self.cancelled = False
+        self.error = None
+
+
+class JobScheduler:
+    """Voert laad- en exportjobs één voor één uit op een eigen thread.
+
+    Zo gebruiken een laad- en een exportjob nooit tegelijk de catalogus. cancel() haalt de
+    wachtende jobs uit de rij en zet het stopsignaal van de engine voor de lopende job; die
+    stopt dan bij de eerstvolgende request. on_start(job) en on_finish(job) worden op de
+    schedulerthread aangeroepen; job.error bevat een onverwachte fout.
+    """
+    def __init__(self, engine, on_start=None, on_finish=None):
+        self.engine = engine
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.current = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._thread = threading.Thread(target=self._run, name="strm-jobs", daemon=True)
+        self._thread.start()
+
+    def submit(self, name, func):
+        """Zet een job in de rij; geeft de Job terug."""
+        job = Job(name, func)
+        with self._lock: self._pending.append(job)
+        self._queue.put(job)
+        return job
+
+    @property
+    def pending(self):
+        with self._lock: return len(self._pending)
+
+    def cancel(self):
+        """Stopt de lopende job en laat de wachtende vallen."""
+        with self._lock:
+            for job in self._pending: job.cancelled = True
+            if self.current: self.current.cancelled = True
+        self.engine.cancel_event.set()
+
+    def close(self):
+        self.cancel()
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None: return
+            with self._lock:
+                self._pending.remove(job)
+                if job.cancelled: continue
+                self.current = job
+                self.engine.cancel_event.clear()
+            if self.on_start: self.on_start(job)
+            try:
+                job.func()
+            except JobCancelled:
+                job.cancelled = True
+            except Exception as e: # Een mislukte job mag de volgende niet tegenhouden
+                job.error = e
+            finally:
+                with self._lock: self.current = None
+                if job.cancelled: self.engine.log(self.engine._('job_cancelled', name=job.name))
+                if self.on_finish: self.on_finish(job)
+
+
+class TmdbCache:
+    """Persistente SQLite-cache voor TMDB: genormaliseerde titel -> show-id en show-id -> details."""
+    MISSING = object()
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute("CREATE TABLE IF NOT EXISTS search (query TEXT PRIMARY KEY, show_id INTEGER, fetched_at REAL)")
+                db.execute("CREATE TABLE IF NOT EXISTS details (show_id INTEGER, language TEXT, body TEXT, "
+                           "fetched_at REAL, PRIMARY KEY (show_id, language))")
+        except sqlite3.Error: pass
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_search(self, query, ttl, negative_ttl):
+        """Geeft het show-id (of None voor 'niet gevonden'), of MISSING als er geen verse entry is."""
+        try:
+            with closing(self._connect()) as db:
+                row = db.execute("SELECT show_id, fetched_at FROM search WHERE query = ?", (query,)).fetchone()
+        except sqlite3.Error:
+            return self.MISSING
+        if not row: return self.MISSING
+        max_age = ttl if row[0] is not None else negative_ttl
+        return row[0] if time.time() - row[1] <= max_age else self.MISSING
+
+    def put_search(self, query, show_id):
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute("INSERT OR REPLACE INTO search VALUES (?, ?, ?)", (query, show_id, time.time()))
+        except sqlite3.Error: pass
+
+    def get_details(self, show_id, language, ttl):
+        try:
+            with closing(self._connect()) as db:
+                row = db.execute("SELECT body, fetched_at FROM details WHERE show_id = ? AND language = ?",
+                                 (show_id, language)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or time.time() - row[1] > ttl: return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def put_details(self, show_id, language, details):
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute("INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)",
+                           (show_id, language, json.dumps(details), time.time()))
+        except sqlite3.Error: pass
+
+
+class VodInfoCache:
+    """Persistente SQLite-cache van film-metadata (get_vod_info plus eventueel TMDB), per stream en 'added'."""
+    def __init__(self, path):
+        self.path = path
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute("CREATE TABLE IF NOT EXISTS movies (stream_key TEXT PRIMARY KEY, added TEXT, body TEXT)")
+        except sqlite3.Error: pass
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, stream_key, added):
+        """Geeft de metadata, of None als er niets is of de film sindsdien opnieuw is toegevoegd."""
+        try:
+            with closing(self._connect()) as db:
+                row = db.execute("SELECT added, body FROM movies WHERE stream_key = ?", (stream_key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or not added or row[0] != added: return None
+        try:
+            return json.loads(row[1])
+        except ValueError:
+            return None
+
+    def put(self, stream_key, added, metadata):
+        try:
+            with closing(self._connect()) as db, db:
+                db.execute("INSERT OR REPLACE INTO movies VALUES (?, ?, ?)", (stream_key, added, json.dumps(metadata)))
+        except sqlite3.Error: pass
+
+
+# --- VERTAALSYSTEEM ---
+LANGUAGES = {
+    'nl': {
+        'app_title': "STRM Bibliotheek Manager - Compleet & Fixed",
+        'settings_frame': "Xtream Codes & Instellingen",
+        'provider_label': "Provider:",
+        'manage_accounts_button': "Beheer Accounts",
+        'tmdb_api_key_label': "TMDB API Key:",
+        'load_list_button': "Lijst Laden (Xtream Codes)",
+        'live_tv_frame': "1. Live TV",
+        'movies_frame': "2. Films (VOD)",
+        'series_frame': "3. Series",
+        'export_m3u_button': "Exporteer M3U",
+        'create_movies_button': "Maak Films",
+        'create_series_button': "Maak Series",
+        'clear_selection_button': "Wis Selectie",
+        'filter_label': "Zoek:",
+        'select_matching_button': "Selecteer Gevonden",
+        'status_frame': "Status & Log",
+        'ready_status': "Klaar voor gebruik.",
+        'language_label': "Taal:",
+        'connecting_status': "Verbinden met provider...",
+        'getting_live_tv_status': "Live TV ophalen...",
+        'getting_movies_status': "Films ophalen...",
+        'getting_series_status': "Series ophalen...",
+        'done_status': "Klaar! Live: {live} | Films: {movies} | Series: {series}",
+        'done_incomplete_status': "Onvolledig geladen (zie de fouten hierboven). Live: {live} | Films: {movies} | Series: {series}",
+        'merge_status': "{providers} providers samengevoegd, {duplicates} dubbele titels weggelaten.",
+        'provider_failed_status': "Provider {name} kon niet worden geladen: {error}",
+        'merge_providers_label': "Alle providers samenvoegen (volgorde = prioriteit)",
+        'no_provider_warning': "Geen provider geselecteerd! Kies er een of voeg toe via 'Beheer'.",
+        'no_live_groups_warning': "Geen Live groepen geselecteerd.",
+        'no_movie_groups_warning': "Geen Film groepen of titels geselecteerd.",
+        'no_series_groups_warning': "Geen Serie groepen of titels geselecteerd.",
+        'export_live_status': "Bezig met Live TV M3U genereren...",
+        'export_live_done': "Klaar! {count} kanalen in M3U gezet.",
+        'epg_status': "Bezig met EPG ophalen en filteren...",
+        'epg_done': "EPG: {channels} kanalen en {programmes} programma's bewaard in {path}",
+        'epg_failed': "EPG kon niet worden gefilterd, de M3U verwijst naar de gids van de provider: {error}",
+        'export_epg_label': "Gefilterde EPG",
+        'movie_nfo_label': "Film-NFO's",
+        'movie_nfo_done': "Film-NFO's: {fetched} opgehaald, {cached} uit de cache, {failed} mislukt.",
+        'plan_summary': "Plan: {files} bestanden in {directories} mappen; nieuw: {new}, gewijzigd: {changed}, ongewijzigd: {unchanged}, pas bij export bekend: {pending}, niet meer aangeboden: {stale}, botsingen: {collisions}.",
+        'plan_collision': "Botsing in {path}: '{other}' zou '{first}' overschrijven en gaat naar '{new}'.",
+        'plan_duplicate': "Dubbele titel '{name}' in {path} wordt overgeslagen.",
+        'plan_more_collisions': "... en nog {count} botsingen.",
+        'progress_phase_load': "Laden",
+        'progress_phase_export_movies': "Films",
+        'progress_phase_movie_nfo': "Film-NFO's",
+        'progress_phase_export_series': "Series",
+        'progress_phase_epg': "EPG",
+        'progress_eta': "nog {eta}",
+        'progress_errors': "{errors} fouten",
+        'job_cancelled': "Gestopt: {name}",
+        'job_queued': "In de wachtrij: {name} ({count} wachtend)",
+        'cancel_button': "Stoppen",
+        'dry_run_label': "Alleen plannen (dry-run)",
+        'search_titles_button': "Titels zoeken",
+        'title_search_window': "Titels zoeken en selecteren",
+        'title_search_hint': "Dubbelklik of spatie: titel (de)selecteren. Leeg zoekveld: toont de geselecteerde titels.",
+        'title_search_count': "{shown} resultaten in {ms:.0f} ms - {selected} titels los geselecteerd",
+        'title_search_not_loaded': "Laad eerst de lijst; de zoekindex wordt tijdens het laden opgebouwd.",
+        'kind_movies': "Film",
+        'kind_series': "Serie",
+        'close_button': "Sluiten",
+        'breaker_open': "{host} geeft steeds fouten; requests gepauzeerd voor {seconds:.0f}s.",
+        'breaker_closed': "{host} reageert weer (na {seconds:.0f}s); requests worden hervat.",
+        'breaker_give_up': "{host} is al {seconds:.0f}s onbereikbaar; de rest mislukt direct en kan later opnieuw geprobeerd worden.",
+        'export_movies_status': "Films worden verwerkt...",
+        'export_movies_done': "Klaar! {count} films verwerkt.",
+        'export_series_status': "Starten met verwerken van {total} series... (Dit kan even duren)",
+        'export_series_progress': "Serie {current}/{total}: {name}",
+        'export_series_done': "Klaar! {episodes} afleveringen verwerkt van {series} series.",
+        'export_series_resume': "Vorige export was onderbroken: {done} van {total} series waren al klaar en worden overgeslagen.",
+        'export_series_failed': "{count} series zijn mislukt; die kunnen later apart opnieuw worden geprobeerd.",
+        'export_incomplete_load': "De lijst is onvolledig geladen: er wordt niets opgeruimd en het manifest blijft zoals het was.",
+        'cli_load_failed': "Laden mislukt, onvolledig of leeg: er wordt niets geëxporteerd.",
+        'cli_export_failed': "Export klaar met {count} fouten.",
+        'retry_failed_question': "Bij de vorige export in deze map zijn {count} series mislukt.\n\nAlleen deze series opnieuw proberen?",
+        'ask_movie_dir_title': "Waar moeten de Films opgeslagen worden?",
+        'ask_series_dir_title': "Waar moeten de Series opgeslagen worden?",
+        'export_summary': "Geschreven: {written} | Ongewijzigd: {skipped} | Opgeruimd: {pruned}",
+        'delta_status': "Wijzigingen sinds de vorige export: {added} nieuw, {changed} gewijzigd, {removed} verdwenen, {unchanged} ongewijzigd.",
+        'changes_only_label': "Alleen wijzigingen exporteren",
+        'io_stats': "| I/O: {files} bestanden in {seconds:.1f}s ({rate:.0f}/s), {errors} fouten",
+        'endpoint_done_status': "{endpoint} klaar: {count} items ({seconds:.1f}s)",
+        'endpoint_stale_status': "{endpoint} mislukt ({error}); de vorige lijst uit de cache wordt gebruikt.",
+        'endpoint_failed_status': "{endpoint} mislukt ({error}) en staat niet in de cache; deze lijst is onvolledig.",
+        'cache_loaded_status': "Catalogus uit cache geladen, bijwerken op de achtergrond...",
+    },
+    'en': {
+        'app_title': "STRM Library Manager - Complete & Fixed",
+        'settings_frame': "Xtream Codes & Settings",
+        'provider_label': "Provider:",
+        'manage_accounts_button': "Manage Accounts",
+        'tmdb_api_key_label': "TMDB API Key:",
+        'load_list_button': "Load List (Xtream Codes)",
+        'live_tv_frame': "1. Live TV",
+        'movies_frame': "2. Movies (VOD)",
+        'series_frame': "3. Series",
+        'export_m3u_button': "Export M3U",
+        'create_movies_button': "Create Movies",
+        'create_series_button': "Create Series",
+        'clear_selection_button': "Clear Selection",
+        'filter_label': "Filter:",
+        'select_matching_button': "Select Matches",
+        'status_frame': "Status & Log",
+        'ready_status': "Ready to use.",
+        'language_label': "Language:",
+        'connecting_status': "Connecting to provider...",
+        'getting_live_tv_status': "Fetching Live TV...",
+        'getting_movies_status': "Fetching Movies...",
+        'getting_series_status': "Fetching Series...",
+        'done_status': "Done! Live: {live} | Movies: {movies} | Series: {series}",
+        'done_incomplete_status': "Loaded incompletely (see the errors above). Live: {live} | Movies: {movies} | Series: {series}",
+        'merge_status': "Merged {providers} providers, skipped {duplicates} duplicate titles.",
+        'provider_failed_status': "Provider {name} could not be loaded: {error}",
+        'merge_providers_label': "Merge all providers (order = priority)",
+        'no_provider_warning': "No provider selected! Please select one or add one via 'Manage'.",
+        'no_live_groups_warning': "No Live TV groups selected.",
+        'no_movie_groups_warning': "No Movie groups or titles selected.",
+        'no_series_groups_warning': "No Series groups or titles selected.",
+        'export_live_status': "Generating Live TV M3U...",
+        'export_live_done': "Done! {count} channels added to M3U.",
+        'epg_status': "Downloading and filtering EPG...",
+        'epg_done': "EPG: {channels} channels and {programmes} programmes saved to {path}",
+        'epg_failed': "EPG could not be filtered, the M3U points to the provider's guide: {error}",
+        'export_epg_label': "Filtered EPG",
+        'movie_nfo_label': "Movie NFOs",
+        'movie_nfo_done': "Movie NFOs: {fetched} fetched, {cached} from cache, {failed} failed.",
+        'plan_summary': "Plan: {files} files in {directories} folders; new: {new}, changed: {changed}, unchanged: {unchanged}, known only during export: {pending}, no longer offered: {stale}, collisions: {collisions}.",
+        'plan_collision': "Collision in {path}: '{other}' would overwrite '{first}' and goes to '{new}' instead.",
+        'plan_duplicate': "Duplicate title '{name}' in {path} is skipped.",
+        'plan_more_collisions': "... and {count} more collisions.",
+        'progress_phase_load': "Loading",
+        'progress_phase_export_movies': "Movies",
+        'progress_phase_movie_nfo': "Movie NFOs",
+        'progress_phase_export_series': "Series",
+        'progress_phase_epg': "EPG",
+        'progress_eta': "{eta} left",
+        'progress_errors': "{errors} errors",
+        'job_cancelled': "Stopped: {name}",
+        'job_queued': "Queued: {name} ({count} waiting)",
+        'cancel_button': "Stop",
+        'dry_run_label': "Plan only (dry run)",
+        'search_titles_button': "Search titles",
+        'title_search_window': "Search and select titles",
+        'title_search_hint': "Double-click or space: (de)select a title. Empty search: shows the selected titles.",
+        'title_search_count': "{shown} results in {ms:.0f} ms - {selected} titles selected individually",
+        'title_search_not_loaded': "Load the list first; the search index is built while loading.",
+        'kind_movies': "Movie",
+        'kind_series': "Series",
+        'close_button': "Close",
+        'breaker_open': "{host} keeps failing; requests paused for {seconds:.0f}s.",
+        'breaker_closed': "{host} is responding again (after {seconds:.0f}s); resuming requests.",
+        'breaker_give_up': "{host} has been unreachable for {seconds:.0f}s; the rest fails right away and can be retried later.",
+        'export_movies_status': "Processing movies...",
+        'export_movies_done': "Done! {count} movies processed.",
+        'export_series_status': "Starting to process {total} series... (This may take a while)",
+        'export_series_progress': "Series {current}/{total}: {name}",
+        'export_series_done': "Done! {episodes} episodes processed from {series} series.",
+        'export_series_resume': "Previous export was interrupted: {done} of {total} series were already done and are skipped.",
+        'export_series_failed': "{count} series failed; they can be retried separately later.",
+        'export_incomplete_load': "The list was loaded incompletely: nothing is pruned and the manifest is left as it was.",
+        'cli_load_failed': "Loading failed, was incomplete or returned nothing: nothing is exported.",
+        'cli_export_failed': "Export finished with {count} errors.",
+        'retry_failed_question': "{count} series failed during the previous export to this folder.\n\nRetry only these series?",
+        'ask_movie_dir_title': "Where should the Movies be saved?",
+        'ask_series_dir_title': "Where should the Series be saved?",
+        'export_summary': "Written: {written} | Unchanged: {skipped} | Pruned: {pruned}",
+        'delta_status': "Changes since the previous export: {added} new, {changed} changed, {removed} gone, {unchanged} unchanged.",
+        'changes_only_label': "Export changes only",
+        'io_stats': "| I/O: {files} files in {seconds:.1f}s ({rate:.0f}/s), {errors} errors",
+        'endpoint_done_status': "{endpoint} done: {count} items ({seconds:.1f}s)",
+        'endpoint_stale_status': "{endpoint} failed ({error}); using the previous list from the cache.",
+        'endpoint_failed_status': "{endpoint} failed ({error}) and is not cached; this list is incomplete.",
+        'cache_loaded_status': "Catalog loaded from cache, refreshing in the background...",
+    }
+}
+
+
+class StrmEngine:
+    """De laad- en exportlogica, bruikbaar vanuit de GUI en headless vanuit de CLI."""
+    def __init__(self, config_path=DEFAULT_CONFIG_PATH, log=None, progress=None):
+        self.config_path = config_path
+        self.log_handler = log or (lambda message: print(message, flush=True))
+        self.on_catalog_loaded = None # Callback(type_key) zodra een kolom geladen is
+        self.progress = progress or ProgressBus() # Voortgang per fase, voor de GUI en de CLI
+        self.cancel_event = threading.Event() # Gezet door JobScheduler.cancel(); gecontroleerd voor elke request
+
+        # --- DATA OPSLAG (STRIKT GESCHEIDEN) ---
+        self.streams_live = StreamCatalog("live")
+        self.streams_movies = StreamCatalog("movie")
+        self.streams_series = StreamCatalog("series")
+
+        self.selected_live = set()
+        self.selected_movies = set()
+        self.selected_series = set()
+        self.selected_titles = {"movies": set(), "series": set()} # Losse titels (row_keys) naast de groepen
+        self.title_index = {} # type_key -> TitleIndex, opgebouwd na het laden
+
+        # Provider & API data
+        self.providers = []
+        self.current_provider = ""
+        self.merge_providers = False # Alle providers tegelijk laden en samenvoegen (prioriteit = volgorde)
+        self.tmdb_api_key = ""
+        self.epg_url = None
+        self.current_lang = 'nl' # Standaard
+
+        # Parallelle export: aantal workers en maximaal gelijktijdige requests per host
+        self.series_workers = DEFAULT_SERIES_WORKERS
+        self.max_per_host = DEFAULT_MAX_PER_HOST
+        self.breaker_give_up = DEFAULT_BREAKER_GIVE_UP
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+
+        # Gedeelde HTTP-sessie (wordt na het laden van de config opnieuw aangemaakt)
+        self.http_pool_size = DEFAULT_HTTP_POOL_SIZE
+        self.http_retries = DEFAULT_HTTP_RETRIES
+        self.http = None
+        self.streaming_ingest = True # Grote stream-lijsten element voor element verwerken
+        self.prune_stale_files = False # Bestanden opruimen die de provider niet meer aanbiedt
+        self.io_workers = DEFAULT_IO_WORKERS
+        self.cache_ttl = dict(DEFAULT_CACHE_TTL)
+        self.catalog_cache = CatalogCache(os.path.join(os.path.dirname(self.config_path), "catalog_cache.sqlite"))
+
+        # TMDB: persistente cache, rate limiter en samenvoegen van gelijktijdige lookups
+        self.tmdb_cache_ttl = DEFAULT_TMDB_CACHE_TTL
+        self.tmdb_negative_ttl = DEFAULT_TMDB_NEGATIVE_TTL
+        self.tmdb_rate = DEFAULT_TMDB_RATE
+        self.tmdb_cache = TmdbCache(os.path.join(os.path.dirname(self.config_path), "tmdb_cache.sqlite"))
+        self.vod_info_cache = VodInfoCache(os.path.join(os.path.dirname(self.config_path), "vod_info_cache.sqlite"))
+        self.tmdb_limiter = None
+        self._tmdb_flight = SingleFlight()
+
+        # Instrumentatie: na elke run een JSON- en Prometheus-rapport in de map 'metrics'
+        self.metrics = Metrics()
+        self.metrics_dir = os.path.join(os.path.dirname(self.config_path), "metrics")
+        self.debug_metrics = False # Log na elke run de traagste requests
+        self.export_epg = False # Gefilterde XMLTV-gids naast de live M3U schrijven
+        self.epg_gzip = True
+        self.movie_nfo = False # movie.nfo per film via get_vod_info (en TMDB als er een sleutel is)
+        self._init_clients()
+
+    def _init_clients(self):
+        """(Her)maakt de HTTP-sessie en de TMDB rate limiter met de huidige instellingen."""
+        if self.http: self.http.close()
+        self.http = create_http_session(self.http_pool_size, self.http_retries)
+        self.tmdb_limiter = TokenBucket(self.tmdb_rate)
+        self._host_slots = {}
+
+    def close(self):
+        if self.http: self.http.close()
+
+    def _(self, key, **kwargs):
+        """Vertaalt een key naar de huidige taal, met optionele placeholders."""
+        return LANGUAGES.get(self.current_lang, LANGUAGES['en']).get(key, key).format(**kwargs)
+
+    # --- HULP FUNCTIES ---
+    def log(self, message):
+        self.log_handler(message)
+
+    def format_progress(self, state):
+        """Eén regel voor een fase uit ProgressBus: aantallen, snelheid, resterende tijd en fouten."""
+        rate, remaining = progress_rate(state)
+        parts = [f"{self._('progress_phase_' + state['phase'])}: {state['done']}"
+                 + (f"/{state['total']} ({100 * state['done'] // max(state['total'], 1)}%)" if state['total'] else ""),
+                 f"{rate:.1f}/s"]
+        if state['bytes']: parts.append(f"{state['bytes'] / 1048576:.1f} MB" if state['bytes'] >= 1048576 else f"{state['bytes'] // 1024} KB")
+        if remaining is not None: parts.append(self._('progress_eta', eta=format_duration(remaining)))
+        if state['errors']: parts.append(self._('progress_errors', errors=state['errors']))
+        return " - ".join(parts)
+
+    def check_cancelled(self):
+        """Gooit JobCancelled op als de lopende job gestopt moet worden."""
+        if self.cancel_event.is_set(): raise JobCancelled()
+
+    def _snapshot(self, type_key):
+        """De catalogus en bevroren kopieën van de selectie (groepen en losse titels), zodat een job niet halverwege van data wisselt."""
+        return (getattr(self, f"streams_{type_key}"), frozenset(getattr(self, f"selected_{type_key}")),
+                frozenset(self.selected_titles.get(type_key, ())))
+
+    def has_selection(self, type_key):
+        """True als er voor dit type een groep of een losse titel geselecteerd is."""
+        return bool(getattr(self, f"selected_{type_key}") or self.selected_titles.get(type_key))
+
+    def search_titles(self, query, limit=SEARCH_LIMIT):
+        """Zoekt in de titels van films en series; geeft (score, type_key, StreamRow), beste eerst."""
+        results = []
+        for type_key, index in self.title_index.items():
+            results.extend((score, type_key, StreamRow(index.catalog, row)) for score, row in index.search(query, limit))
+        results.sort(key=lambda result: -result[0])
+        return results[:limit]
+
+    def toggle_title(self, type_key, row):
+        """Zet één titel aan of uit in de selectie; geeft True als hij nu geselecteerd is."""
+        selected, key = self.selected_titles[type_key], row.catalog.row_key(row.index)
+        if key in selected:
+            selected.discard(key)
+            return False
+        selected.add(key)
+        return True
+
+    def selected_title_rows(self, type_key):
+        """De los geselecteerde titels die in de geladen catalogus voorkomen."""
+        catalog, keys = getattr(self, f"streams_{type_key}"), self.selected_titles[type_key]
+        if not keys: return []
+        return [StreamRow(catalog, index) for index in range(len(catalog)) if catalog.row_key(index) in keys]
+
+    def sanitize_filename(self, name):
+        return re.sub(r'[<>:"/\\|?*]', '', str(name)).strip()
+
+    def _write_metrics(self, run_name):
+        """Schrijft het metrics-rapport van de laatste run als <run>.json en <run>.prom."""
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            atomic_write_text(os.path.join(self.metrics_dir, f"{run_name}.json"), json.dumps(self.metrics.to_dict(), indent=2))
+            atomic_write_text(os.path.join(self.metrics_dir, f"{run_name}.prom"), self.metrics.to_prometheus(run_name))
+        except OSError: pass
+        if self.debug_metrics:
+            for entry in self.metrics.slowest()[:10]:
+                self.log(f"[traag] {entry['seconds']:.2f}s {entry['kind']}:{entry['name']} {entry['detail']}")
+            for host, limiter in list(self._host_slots.items()):
+                stats = limiter.stats()
+                latency = f"{stats['latency'] * 1000:.0f} ms" if stats['latency'] is not None else "-"
+                self.log(f"[limiet] {host}: {stats['limit']:.1f} gelijktijdig, latency {latency}{', breaker open' if stats['open'] else ''}")
+
+    def _finish_manifest(self, manifest, writer, allow_prune=True, save=True):
+        """Ruimt (optioneel) verouderde bestanden op, bewaart het manifest en geeft de samenvatting met I/O-statistieken.
+
+        Na een onvolledige load (save=False) blijft het vorige manifest staan: het nieuwe mist titels die er nog zijn.
+        """
+        if self.prune_stale_files and allow_prune and save:
+            manifest.prune()
+        if save: manifest.save()
+        summary = self._('export_summary', written=manifest.written, skipped=manifest.skipped, pruned=manifest.pruned)
+        io_stats = self._('io_stats', files=writer.files, seconds=writer.elapsed, rate=writer.files_per_second, errors=writer.errors)
+        return f"{summary} {io_stats}"
+
+    # --- CRYPTO & CONFIG ---
+    def encrypt_pass(self, password):
+        if not WIN_CRYPTO_AVAILABLE or not password: return password
+        try:
+            data = win32crypt.CryptProtectData(password.encode(), None, None, None, None, 0)
+            return base64.b64encode(data).decode()
+        except: return password
+
+    def decrypt_pass(self, encrypted):
+        if not WIN_CRYPTO_AVAILABLE or not encrypted: return encrypted
+        try: # pywintypes.error kan optreden als data corrupt is
+            data = base64.b64decode(encrypted.encode())
+            return win32crypt.CryptUnprotectData(data, None, None, None, 0)[1].decode()
+        except: return encrypted
+
+    def load_config(self):
+        """Leest config.json; geeft False als het bestand ontbreekt of onleesbaar is."""
+        if not os.path.exists(self.config_path): return False
+        try:
+            with open(self.config_path, "r") as f:
+                data = json.load(f)
+            self.selected_live = set(data.get("selected_live", []))
+            self.selected_movies = set(data.get("selected_movies", []))
+            self.selected_series = set(data.get("selected_series", []))
+            titles = data.get("selected_titles", {})
+            self.selected_titles = {type_key: set(titles.get(type_key, [])) for type_key in ("movies", "series")}
+            self.providers = data.get("providers", [])
+            self.current_provider = data.get("last_provider") or ""
+            self.merge_providers = bool(data.get("merge_providers", False))
+            self.tmdb_api_key = data.get("tmdb_api_key", "")
+            self.current_lang = data.get("language", "nl")
+            self.series_workers = max(1, int(data.get("series_workers", DEFAULT_SERIES_WORKERS)))
+            self.max_per_host = max(1, int(data.get("max_per_host", DEFAULT_MAX_PER_HOST)))
+            self.breaker_give_up = max(0.0, float(data.get("breaker_give_up", DEFAULT_BREAKER_GIVE_UP)))
+            self.http_pool_size = max(1, int(data.get("http_pool_size", DEFAULT_HTTP_POOL_SIZE)))
+            self.http_retries = max(0, int(data.get("http_retries", DEFAULT_HTTP_RETRIES)))
+            self.streaming_ingest = bool(data.get("streaming_ingest", True))
+            self.prune_stale_files = bool(data.get("prune_stale_files", False))
+            self.io_workers = max(1, int(data.get("io_workers", DEFAULT_IO_WORKERS)))
+            self.debug_metrics = bool(data.get("debug_metrics", False))
+            self.export_epg = bool(data.get("export_epg", False))
+            self.epg_gzip = bool(data.get("epg_gzip", True))
+            self.movie_nfo = bool(data.get("movie_nfo", False))
+            self.tmdb_cache_ttl = float(data.get("tmdb_cache_ttl", DEFAULT_TMDB_CACHE_TTL))
+            self.tmdb_negative_ttl = float(data.get("tmdb_negative_ttl", DEFAULT_TMDB_NEGATIVE_TTL))
+            self.tmdb_rate = max(0.1, float(data.get("tmdb_rate", DEFAULT_TMDB_RATE)))
+            self.cache_ttl.update({k: float(v) for k, v in data.get("cache_ttl", {}).items() if k in DEFAULT_CACHE_TTL})
+        except (json.JSONDecodeError, OSError, ValueError):
+            return False
+        finally:
+            self._init_clients()
+        return True
+
+    def save_config(self):
+        data = {
+            "selected_live": list(self.selected_live),
+            "selected_movies": list(self.selected_movies),
+            "selected_series": list(self.selected_series),
+            "selected_titles": {type_key: sorted(keys) for type_key, keys in self.selected_titles.items()},
+            "providers": self.providers,
+            "last_provider": self.current_provider,
+            "merge_providers": self.merge_providers,
+            "tmdb_api_key": self.tmdb_api_key,
+            "language": self.current_lang,
+            "series_workers": self.series_workers,
+            "max_per_host": self.max_per_host,
+            "breaker_give_up": self.breaker_give_up,
+            "http_pool_size": self.http_pool_size,
+            "http_retries": self.http_retries,
+            "streaming_ingest": self.streaming_ingest,
+            "prune_stale_files": self.prune_stale_files,
+            "io_workers": self.io_workers,
+            "debug_metrics": self.debug_metrics,
+            "export_epg": self.export_epg,
+            "epg_gzip": self.epg_gzip,
+            "movie_nfo": self.movie_nfo,
+            "cache_ttl": self.cache_ttl,
+            "tmdb_cache_ttl": self.tmdb_cache_ttl,
+            "tmdb_negative_ttl": self.tmdb_negative_ttl,
+            "tmdb_rate": self.tmdb_rate
+        }
+        try:
+            with open(self.config_path, "w") as f:
+                json.dump(data, f, indent=2)
+        except OSError: pass
+
+    def get_provider(self, name=None):
+        """Geeft de provider met deze naam (standaard de huidige), of None."""
+        name = self.current_provider if name is None else name
+        return next((p for p in self.providers if p['name'] == name), None)
+
+    # --- XTREAM CODES LOGICA ---
+    def _host_slot(self, url):
+        """Geeft de AdaptiveLimiter (gelijktijdige requests en circuit breaker) van de host van url."""
+        host = urlsplit(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = AdaptiveLimiter(host, self.max_per_host, self.breaker_give_up, self._on_limiter_event)
+                self._host_slots[host] = slot
+            return slot
+
+    def _on_limiter_event(self, event, host, seconds):
+        """Meldt het openen en sluiten van een circuit breaker (en het opgeven tijdens een lange storing)."""
+        self.log(self._('breaker_' + event, host=host, seconds=seconds))
+
+    @staticmethod
+    def _request_detail(params):
+        """Beschrijving van een request voor de metrics, zonder inloggegevens."""
+        return " ".join(f"{k}={v}" for k, v in params.items() if k not in ("username", "password", "server", "action", "api_key"))
+
+    def _api_get(self, url, params):
+        """Doet één API-request en geeft de JSON, of None bij een fout.
+
+        429/5xx, een lege body, een HTML-foutpagina, ongeldige JSON en netwerkfouten tellen
+        als fout voor de AdaptiveLimiter van de host (lagere grens, eventueel de breaker open).
+        """
+        # requests.packages.urllib3.disable_warnings() # Optioneel
+        self.check_cancelled()
+        limiter = self._host_slot(url)
+        for attempt in range(self.http_retries + 1):
+            if attempt: # urllib3 herhaalt alleen op status; een foutpagina met 200 opnieuw via de limiter (en dus na een breaker-pauze)
+                self.cancel_event.wait(0.5 * 2 ** (attempt - 1))
+            start, size, ok = time.perf_counter(), 0, False
+            try:
+                with limiter.slot(self.check_cancelled) as outcome:
+                    r = self.http.get(url, params=params, timeout=30, verify=False)
+                    outcome["seconds"], outcome["congested"] = r.elapsed.total_seconds(), response_retried(r)
+                    size = len(r.content)
+                    self.progress.advance(done=0, nbytes=size)
+                    problem = response_problem(r)
+                    if problem is None and r.ok:
+                        try:
+                            result = r.json()
+                        except ValueError:
+                            problem = "geen geldige JSON"
+                    outcome["ok"] = problem is None # Een andere 4xx is een fout van het request, niet van de host
+                    if problem and r.ok: continue
+                    if problem or not r.ok: return None
+                ok = True
+                return result
+            except JobCancelled:
+                raise
+            except Exception as e:
+                return None
+            finally:
+                self.metrics.observe("api", params.get("action", ""), time.perf_counter() - start, size, ok, self._request_detail(params))
+        return None
+
+    def _api_stream(self, url, params, parse=iter_json_array, name=None):
+        """Haalt een JSON-array (of met parse=iter_m3u een playlist) op en levert de elementen één voor één op."""
+        start, size, ok = time.perf_counter(), 0, False
+
+        def counted(chunks):
+            nonlocal size
+            for chunk in chunks:
+                self.check_cancelled() # Ook midden in een grote download
+                size += len(chunk)
+                self.progress.advance(done=0, nbytes=len(chunk))
+                yield chunk
+        self.check_cancelled()
+        limiter = self._host_slot(url)
+        try:
+            # Het slot alleen tot de response-headers: een lange download mag de andere
+            # endpoints van de load, die tegelijk lopen, niet ophouden
+            with limiter.slot(self.check_cancelled) as outcome:
+                r = self.http.get(url, params=params, timeout=30, verify=False, stream=True)
+                outcome["seconds"], outcome["congested"] = r.elapsed.total_seconds(), response_retried(r)
+                if r.status_code == 429 or r.status_code >= 500 or "html" in r.headers.get("Content-Type", "").lower():
+                    outcome["ok"] = False # Fout van de host
+                elif not r.ok:
+                    outcome["ok"] = True # Een andere 4xx is een fout van dit request, de host werkt
+                else:
+                    outcome["deferred"] = True # Telt pas als de body gelezen is
+            body_ok = None # Blijft None als de job stopt of de lezer eerder ophoudt
+            try:
+                with r:
+                    r.raise_for_status()
+                    try:
+                        yield from parse(counted(r.iter_content(chunk_size=STREAM_CHUNK_SIZE)))
+                    except (ValueError, ElementTree.ParseError, requests.RequestException):
+                        body_ok = False # Foutpagina, afgebroken of onleesbare body
+                        raise
+                    if not size:
+                        body_ok = False
+                        raise requests.RequestException("lege body")
+                    body_ok = True
+            finally:
+                if outcome["deferred"]:
+                    limiter.report(body_ok, outcome["seconds"], outcome["probe"], outcome["congested"])
+            ok = True
+        finally:
+            self.metrics.observe("api", name or params.get("action", ""), time.perf_counter() - start, size, ok, self._request_detail(params))
+
+    def _provider_cache_key(self, provider):
+        return f"{provider['server'].rstrip('/')}|{provider['username']}"
+
+    def _endpoint_items(self, base_url, auth, action, cache_key, cache_only=False):
+        """Levert de items van een endpoint uit de cache als die vers is, anders van de provider (en vult de cache).
+
+        Een mislukte of afgebroken response wordt niet gecachet maar als exceptie doorgegeven.
+        """
+        fields = CACHE_FIELDS[action]
+        cached = self.catalog_cache.get(cache_key, action, fields, None if cache_only else self.cache_ttl.get(action))
+        if cached is not None or cache_only:
+            yield from cached or []
+            return
+        params = {**auth, "action": action}
+        if self.streaming_ingest:
+            source = self._api_stream(base_url, params)
+        else:
+            source = self._api_get(base_url, params)
+            if source is None:
+                raise requests.RequestException("geen geldige response")
+        rows = []
+        for item in source:
+            rows.append([item.get(f) for f in fields])
+            yield item
+        # Alleen na een volledig gelezen response (een fout komt hier niet); ook een lege lijst,
+        # anders is de cache van een provider zonder bv. series nooit compleet
+        self.catalog_cache.put(cache_key, action, fields, rows)
+
+    def _providers_to_load(self):
+        """Bij samenvoegen alle providers (op volgorde van prioriteit), anders alleen de huidige."""
+        if self.merge_providers and len(self.providers) > 1:
+            return list(self.providers)
+        provider = self.get_provider()
+        return [provider] if provider else []
+
+    def cached_catalog_state(self):
+        """None als er nog geen volledige cache voor de te laden provider(s) is, anders True als een deel verlopen is."""
+        providers = self._providers_to_load()
+        if not providers: return None
+        stale = False
+        for provider in providers:
+            cache_key = self._provider_cache_key(provider)
+            ages = {a: self.catalog_cache.age(cache_key, a, f) for a, f in CACHE_FIELDS.items()}
+            if any(age is None for age in ages.values()): return None
+            stale = stale or any(age > self.cache_ttl.get(a, 0) for a, age in ages.items())
+        return stale
+
+    @instrumented("load")
+    def load_from_xtream(self, cache_only=False):
+        """Laadt categorieën en streams (uit de cache waar die vers is); cache_only gebruikt alleen de cache."""
+        providers = self._providers_to_load()
+        
+        if not providers:
+            self.log(self._('no_provider_warning'))
+            return False
+
+        self.log(self._('connecting_status'))
+        endpoints = sum(1 if p.get('type') == 'm3u' else len(CACHE_FIELDS) for p in providers)
+        with self.progress.phase("load", endpoints):
+            if len(providers) == 1:
+                self._load_provider(providers[0], cache_only, publish=True)
+            else:
+                self._load_merged(providers, cache_only)
+        self._build_title_indexes()
+
+        complete = all(getattr(self, f"streams_{t}").complete for t in ("live", "movies", "series"))
+        self.log(self._('done_status' if complete else 'done_incomplete_status',
+                        live=len(self.streams_live), movies=len(self.streams_movies), series=len(self.streams_series)))
+        return complete
+
+    def _build_title_indexes(self):
+        """Bouwt de zoekindex over de film- en serietitels van de zojuist geladen catalogi."""
+        with self.metrics.phase("load/index"):
+            self.title_index = {type_key: TitleIndex(getattr(self, f"streams_{type_key}")) for type_key in ("movies", "series")}
+
+    def _epg_url(self, provider):
+        server = provider['server'].rstrip('/')
+        return f"{server}/xmltv.php?username={provider['username']}&password={self.decrypt_pass(provider.get('password', ''))}"
+
+    def _load_provider(self, provider, cache_only, publish):
+        """Laadt de catalogi van één provider; met publish worden de kolommen direct gevuld zodra ze binnen zijn."""
+        if provider.get('type') == 'm3u':
+            return self._load_m3u(provider, cache_only, publish)
+        server = provider['server'].rstrip('/')
+        username = provider['username']
+        password = self.decrypt_pass(provider.get('password', ''))
+        
+        base_url = f"{server}/player_api.php" # Let op: auth wordt hieronder toegevoegd
+        auth = {"username": username, "password": password}
+        cache_key = self._provider_cache_key(provider)
+
+        def items(action):
+            return self._endpoint_items(base_url, auth, action, cache_key, cache_only)
+
+        failed = set() # Soorten waarvan een endpoint mislukte zonder cache om op terug te vallen
+
+        def fetch(type_key, action, consume):
+            start = time.perf_counter()
+            label = action if publish else f"{provider['name']}: {action}"
+            with self.metrics.phase(f"load/{action}"):
+                try:
+                    result = consume(items(action))
+                except JobCancelled:
+                    raise
+                except Exception as e: # Liever de verlopen maar volledige lijst uit de cache dan een lege of halve
+                    stale = self.catalog_cache.get(cache_key, action, CACHE_FIELDS[action])
+                    if stale is None:
+                        failed.add(type_key)
+                    self.log(self._('endpoint_stale_status' if stale is not None else 'endpoint_failed_status',
+                                    endpoint=label, error=describe_error(e)))
+                    result = consume(stale or iter(()))
+            self.progress.advance(phase="load")
+            self.log(self._('endpoint_done_status', endpoint=label, count=len(result), seconds=time.perf_counter() - start))
+            return result
+
+        # Alle categorie- en stream-endpoints worden tegelijk opgehaald. Streams worden eerst op
+        # category_id gegroepeerd; de categorienamen worden erop gezet zodra beide klaar zijn, en
+        # elke kolom wordt gevuld zodra zijn eigen data binnen is.
+        plan = (("live", "get_live_categories", "get_live_streams"),
+                ("movies", "get_vod_categories", "get_vod_streams"),
+                ("series", "get_series_categories", "get_series"))
+        catalogs = {}
+        with ThreadPoolExecutor(max_workers=2 * len(plan)) as pool:
+            jobs = {}
+            for type_key, cat_action, stream_action in plan:
+                cats = pool.submit(fetch, type_key, cat_action, list)
+                ingest = lambda raw, t=type_key: self._ingest_streams(t, raw, server, username, password)
+                jobs[pool.submit(fetch, type_key, stream_action, ingest)] = (type_key, cats)
+            for future in as_completed(jobs):
+                type_key, cats = jobs[future]
+                catalog = future.result()
+                catalog.relabel_groups({c['category_id']: c['category_name'] for c in cats.result()}, "Onbekend")
+                catalog.complete = type_key not in failed
+                catalogs[type_key] = catalog
+                self.check_cancelled() # Een gestopte load publiceert niets over de vorige catalogus heen
+                if publish:
+                    setattr(self, f"streams_{type_key}", catalog)
+                    if self.on_catalog_loaded: self.on_catalog_loaded(type_key)
+        if publish:
+            self.epg_url = self._epg_url(provider)
+        return catalogs
+
+    def _m3u_source(self, provider):
+        """Geeft (playlist-URL, query-parameters, (server, gebruikersnaam, wachtwoord)) voor een M3U-provider.
+
+        Het serverveld mag een volledige playlist-URL zijn; anders wordt get.php?type=m3u_plus gebruikt.
+        """
+        address = provider['server'].strip()
+        password = self.decrypt_pass(provider.get('password', ''))
+        parts = urlsplit(address)
+        if parts.path.strip('/'):
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            source = (f"{parts.scheme}://{parts.netloc}", provider.get('username') or query.get('username', ''),
+                      password or query.get('password', ''))
+            return address, {}, source
+        server = address.rstrip('/')
+        params = {"username": provider['username'], "password": password, "type": "m3u_plus", "output": "ts"}
+        return f"{server}/get.php", params, (server, provider['username'], password)
+
+    def _load_m3u(self, provider, cache_only, publish):
+        """Laadt een M3U-playlist (streamend, regel voor regel) in de live-, film- en seriecatalogus."""
+        url, params, (server, username, password) = self._m3u_source(provider)
+
+        def empty_catalogs():
+            return {"live": StreamCatalog("live", server, username, password, extra_fields=("logo", "epg_id")),
+                    "movies": StreamCatalog("movie", server, username, password, extra_fields=("added",)),
+                    "series": StreamCatalog("series", server, username, password, extra_fields=("cover", "plot", "last_modified"))}
+        catalogs = empty_catalogs()
+        if not cache_only: # Playlists worden niet gecachet
+            start = time.perf_counter()
+            label = "get.php" if publish else f"{provider['name']}: get.php"
+            with self.metrics.phase("load/get.php"):
+                try:
+                    count = self._ingest_m3u(catalogs, self._api_stream(url, params, parse=iter_m3u, name="get.php"), server, username, password)
+                except JobCancelled:
+                    raise
+                except Exception as e: # Geen cache om op terug te vallen: lege, onvolledige catalogi
+                    self.log(self._('endpoint_failed_status', endpoint=label, error=describe_error(e)))
+                    catalogs, count = empty_catalogs(), 0
+                    for catalog in catalogs.values(): catalog.complete = False
+            self.progress.advance(phase="load")
+            self.log(self._('endpoint_done_status', endpoint=label, count=count, seconds=time.perf_counter() - start))
+        self.check_cancelled()
+        if publish:
+            for type_key, catalog in catalogs.items():
+                setattr(self, f"streams_{type_key}", catalog)
+                if self.on_catalog_loaded: self.on_catalog_loaded(type_key)
+            self.epg_url = self._epg_url(provider) if not urlsplit(provider['server'].strip()).path.strip('/') else None
+        return catalogs
+
+    @staticmethod
+    def _ingest_m3u(catalogs, entries, server, username, password):
+        """Verdeelt M3U-entries over de catalogi; afleveringen worden per serie (groep + titel) verzameld."""
+        shows = {} # (groep, serienaam) -> rij-index in de seriecatalogus
+        series = catalogs["series"]
+        count = 0
+        for e in entries:
+            count += 1
+            url, name = e['url'], e.get('name') or e.get('tvg-name', '')
+            group = e.get('group-title') or "Onbekend"
+            kind = classify_m3u_url(url)
+            # Xtream-achtige URL's van dezelfde account compact opslaan, andere URL's volledig
+            m = XTREAM_STREAM_PATH.match(urlsplit(url).path)
+            compact = m and url.startswith(server + "/") and (m.group(1), m.group(2)) == (username, password)
+            stream_id = int(m.group(3)) if compact else zlib.crc32(url.encode("utf-8")) # Stabiele id voor manifest en delta
+            ext = (m.group(4) if compact else None) or os.path.splitext(urlsplit(url).path)[1].lstrip('.') or ("ts" if kind == "live" else "mp4")
+            direct = None if compact else url
+            if kind == "live":
+                catalogs["live"].append(name, group, stream_id, ext, url=direct, logo=e.get('tvg-logo', ''), epg_id=e.get('tvg-id', ''))
+            elif kind == "movies":
+                catalogs["movies"].append(name, group, stream_id, ext, url=direct, added='')
+            else:
+                ep = EPISODE_TITLE.match(name)
+                show = ep.group('show').strip() if ep and ep.group('show').strip() else name
+                index = shows.get((group, show))
+                if index is None:
+                    index = shows[(group, show)] = len(series)
+                    series_id = zlib.crc32(f"{group}|{show}".encode("utf-8")) # Stabiel over loads heen
+                    series.append(show, group, series_id, cover=e.get('tvg-logo', ''), plot='', last_modified='')
+                    series.local_episodes[series.row_key(index)] = []
+                episodes = series.local_episodes[series.row_key(index)]
+                season, number = (int(ep.group('season')), int(ep.group('episode'))) if ep else (1, len(episodes) + 1)
+                episodes.append((season, number, stream_id, ext, name, direct, e.get('tvg-logo', '')))
+                series.extra['last_modified'][index] = str(len(episodes)) # Nieuwe aflevering = gewijzigde serie
+        return count
+
+    def _load_merged(self, providers, cache_only):
+        """Laadt meerdere providers tegelijk en voegt hun catalogi samen zonder dubbele titels."""
+        with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+            futures = [pool.submit(self._load_provider, p, cache_only, False) for p in providers]
+        loaded, error = [], None
+        for provider, future in zip(providers, futures):
+            try:
+                loaded.append((provider, future.result()))
+            except JobCancelled:
+                raise
+            except Exception as e: # Een provider die faalt mag de andere niet tegenhouden
+                self.log(self._('provider_failed_status', name=provider['name'], error=describe_error(e)))
+                error = e
+        if not loaded: # Niets geladen: de vorige catalogi blijven staan
+            raise requests.RequestException(describe_error(error)) from None
+        self.check_cancelled()
+
+        duplicates = 0
+        for type_key in ("live", "movies", "series"):
+            catalog, dups = merge_catalogs([catalogs[type_key] for _, catalogs in loaded])
+            catalog.complete = catalog.complete and len(loaded) == len(providers) # Titels van een mislukte provider ontbreken
+            duplicates += dups
+            setattr(self, f"streams_{type_key}", catalog)
+            if self.on_catalog_loaded: self.on_catalog_loaded(type_key)
+        self.epg_url = self._epg_url(loaded[0][0])
+        self.log(self._('merge_status', providers=len(loaded), duplicates=duplicates))
+
+    def _ingest_streams(self, type_key, raw_items, server, username, password):
+        """Zet ruwe stream-items om naar een StreamCatalog, voorlopig gegroepeerd op category_id."""
+        if type_key == "live":
+            catalog = StreamCatalog("live", server, username, password, extra_fields=("logo", "epg_id"))
+            for s in raw_items:
+                catalog.append(s['name'], s['category_id'], s['stream_id'], "ts",
+                               logo=s.get('stream_icon', ''), epg_id=s.get('epg_channel_id', ''))
+        elif type_key == "movies":
+            catalog = StreamCatalog("movie", server, username, password, extra_fields=("added",))
+            for s in raw_items:
+                catalog.append(s['name'], s['category_id'], s['stream_id'], s.get('container_extension', 'mp4'),
+                               added=s.get('added') or '')
+        else:
+            catalog = StreamCatalog("series", server, username, password, extra_fields=("cover", "plot", "last_modified"))
+            for s in raw_items:
+                # Het series_id is CRUCIAAL voor get_series_info tijdens de export
+                catalog.append(s['name'], s['category_id'], s['series_id'],
+                               cover=s.get('cover', ''), plot=s.get('plot', ''), last_modified=s.get('last_modified') or '')
+        return catalog
+
+    # --- EXPORT FUNCTIES ---
+    @instrumented("export_live")
+    def export_live_logic(self, filename):
+        self.log(self._('export_live_status'))
+        catalog, selected, _ = self._snapshot("live")
+        epg_url = self.epg_url
+        if self.export_epg and self.epg_url:
+            channel_ids = {s['epg_id'].casefold() for s in catalog.in_groups(selected) if s.get('epg_id')}
+            epg_url = self.export_epg_logic(filename, channel_ids) or epg_url
+        count = 0
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f'#EXTM3U x-tvg-url="{epg_url}"\n')
+            for s in catalog.in_groups(selected):
+                epg_id = s.get('epg_id', '')
+                f.write(f'#EXTINF:-1 tvg-id="{epg_id}" tvg-name="{s["name"]}" tvg-logo="{s["logo"]}" group-title="{s["group"]}",{s["name"]}\n')
+                f.write(f"{s['url']}\n")
+                count += 1
+        self.log(self._('export_live_done', count=count))
+
+    def export_epg_logic(self, m3u_filename, channel_ids):
+        """Downloadt de XMLTV-gids streamend en bewaart alleen de gevraagde kanalen naast de M3U.
+
+        Geeft het pad van de gids terug, of None als ophalen of verwerken mislukt.
+        """
+        path = os.path.splitext(os.path.abspath(m3u_filename))[0] + (".xml.gz" if self.epg_gzip else ".xml")
+        directory, name = os.path.split(path)
+        tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+        opener = functools.partial(gzip.open, compresslevel=6) if self.epg_gzip else open
+        counts = {"channel": 0, "programme": 0}
+        self.log(self._('epg_status'))
+        try:
+            with self.metrics.phase("export_live/epg"), self.progress.phase("epg"):
+                with opener(tmp_path, "wt", encoding="utf-8") as f:
+                    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+                    for tag, xml in self._api_stream(self.epg_url, {}, parse=lambda chunks: iter_xmltv(chunks, channel_ids), name="xmltv.php"):
+                        f.write(xml + "\n")
+                        if tag in counts: counts[tag] += 1
+                    f.write("</tv>\n")
+                os.replace(tmp_path, path)
+        except (requests.exceptions.RequestException, ElementTree.ParseError, OSError) as e:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            self.log(self._('epg_failed', error=describe_error(e)))
+            return None
+        self.log(self._('epg_done', channels=counts["channel"], programmes=counts["programme"], path=path))
+        return path
+
+    def _log_delta(self, delta):
+        self.log(self._('delta_status', **{k: len(v) for k, v in delta.items()}))
+
+    def _log_plan(self, plan, manifest):
+        """Meldt de omvang van een plan, de verwachte wijzigingen en (de eerste) botsingen."""
+        self.log(self._('plan_summary', **plan.summary(manifest)))
+        for directory, first, other, new_dir in plan.collisions[:MAX_LOGGED_COLLISIONS]:
+            rel = os.path.relpath(directory, plan.base_dir)
+            if new_dir is None: self.log(self._('plan_duplicate', path=rel, name=other))
+            else: self.log(self._('plan_collision', path=rel, first=first, other=other, new=os.path.basename(new_dir)))
+        if len(plan.collisions) > MAX_LOGGED_COLLISIONS:
+            self.log(self._('plan_more_collisions', count=len(plan.collisions) - MAX_LOGGED_COLLISIONS))
+
+    def plan_movies(self, base_dir, catalog=None, selected=None, titles=()):
+        """Bepaalt voor de geselecteerde films alle mappen en bestanden, zonder iets te schrijven."""
+        if catalog is None: catalog, selected, titles = self._snapshot("movies")
+        plan = ExportPlan(base_dir)
+        for s in catalog.in_selection(selected, titles):
+            cat_folder = self.sanitize_filename(s['group'])
+            title = self.sanitize_filename(s['name'])
+            year = re.search(r'[\(\[](\d{4})[\)\]]', title)
+            folder_name = f"{title} ({year.group(1)})" if year else title
+            files = {f"{title}.strm": s['url']}
+            if self.movie_nfo: files["movie.nfo"] = None
+            plan.add(os.path.join(base_dir, cat_folder, folder_name), s, files)
+        return plan
+
+    def plan_series(self, base_dir, catalog=None, selected=None, titles=()):
+        """Bepaalt voor de geselecteerde series de mappen; de afleveringen volgen pas uit get_series_info."""
+        if catalog is None: catalog, selected, titles = self._snapshot("series")
+        plan = ExportPlan(base_dir)
+        for s in catalog.in_selection(selected, titles):
+            plan.add(self._series_dir(base_dir, s), s)
+        return plan
+
+    @instrumented("export_movies")
+    def export_movies_logic(self, base_dir, changes_only=False, dry_run=False):
+        """Schrijft de .strm-bestanden; met changes_only alleen voor films die nieuw zijn of een nieuwe 'added' hebben.
+
+        Met movie_nfo komt er per film ook een movie.nfo, parallel opgehaald en gecachet op stream en 'added'.
+        Eerst wordt het volledige plan gemaakt; met dry_run blijft het daarbij en wordt het plan teruggegeven,
+        anders het aantal fouten (mislukte movie.nfo's en schrijffouten).
+        """
+        catalog, selected, titles = self._snapshot("movies")
+        if not len(catalog): # Niet geladen: niets exporteren (en zeker niets opruimen)
+            self.log(self._('no_movie_groups_warning'))
+            return
+        self.log(self._('export_movies_status'))
+        manifest = ExportManifest(base_dir, "movies")
+        with self.metrics.phase("export_movies/plan"):
+            plan = self.plan_movies(base_dir, catalog, selected, titles)
+        self._log_plan(plan, manifest)
+        if dry_run: return plan
+        snapshot = SyncSnapshot(base_dir, "movies")
+        stamps = {catalog.row_key(s.index): s['added'] for _, s, _ in plan.entries}
+        delta = compute_delta(snapshot.items, stamps)
+        if changes_only: self._log_delta(delta)
+        sources = self._api_sources(catalog)
+        nfo_results = {"cached": 0, "fetched": 0, "failed": 0}
+        count = 0
+        cancelled = False
+        with OutputWriter(manifest, self.io_workers, self.metrics) as writer, ThreadPoolExecutor(max_workers=self.series_workers) as pool:
+            nfo_futures = []
+            self.progress.start("export_movies", len(plan.entries))
+            for directory, s, _ in plan.ordered():
+                path = os.path.join(directory, f"{self.sanitize_filename(s['name'])}.strm")
+                nfo_path = os.path.join(directory, "movie.nfo")
+                if cancelled or self.cancel_event.is_set(): # Gestopt: de rest blijft zoals het was
+                    cancelled = True
+                    manifest.keep_file(path)
+                    manifest.keep_file(nfo_path)
+                    continue
+                count += 1
+                self.progress.advance(phase="export_movies")
+                if changes_only and catalog.row_key(s.index) in delta["unchanged"] and manifest.keep_file(path):
+                    # De .strm blijft staan; een ontbrekende movie.nfo (bv. net aangezet) wordt alsnog geschreven
+                    if self.movie_nfo and not manifest.keep_file(nfo_path):
+                        nfo_futures.append(pool.submit(self._write_movie_nfo, s, nfo_path, sources, writer))
+                    continue
+                writer.write(path, s['url'])
+                if self.movie_nfo: nfo_futures.append(pool.submit(self._write_movie_nfo, s, nfo_path, sources, writer))
+            self.progress.finish("export_movies")
+            if nfo_futures:
+                with self.metrics.phase("export_movies/nfo"), self.progress.phase("movie_nfo", len(nfo_futures)):
+                    for future in as_completed(nfo_futures):
+                        try:
+                            result = future.result()
+                        except JobCancelled:
+                            cancelled, result = True, "failed"
+                        nfo_results[result] += 1
+                        self.progress.advance(errors=int(result == "failed"), phase="movie_nfo")
+        if self.movie_nfo: self.log(self._('movie_nfo_done', **nfo_results))
+        if not catalog.complete: self.log(self._('export_incomplete_load'))
+        if not cancelled and catalog.complete: snapshot.save(stamps)
+        with self.metrics.phase("export_movies/finish"):
+            summary = self._finish_manifest(manifest, writer, allow_prune=not cancelled, save=catalog.complete)
+        if cancelled: raise JobCancelled() # Manifest en momentopname zijn bijgewerkt; de scheduler meldt het stoppen
+        self.log(f"{self._('export_movies_done', count=count)} {summary}")
+        return nfo_results["failed"] + writer.errors
+
+    def _movie_metadata(self, row, sources):
+        """Geeft (metadata, bron) voor een film: 'cached', 'fetched' of bij een fout (None, 'failed')."""
+        key, added = row.catalog.row_key(row.index), row['added']
+        cached = self.vod_info_cache.get(key, added)
+        if cached is not None: return cached, "cached"
+        info = None
+        for source, stream_id, _ in row['candidates']: # Voorkeursprovider eerst, dan de andere
+            api_url, auth = sources[source]
+            res = self._api_get(api_url, {**auth, "action": "get_vod_info", "vod_id": stream_id})
+            if res is not None:
+                info = res.get('info') if isinstance(res, dict) and isinstance(res.get('info'), dict) else {}
+                break
+        if info is None: return None, "failed"
+
+        title = re.sub(r'[\(\[]\d{4}[\)\]]', '', row['name']).strip()
+        year = re.search(r'[\(\[](\d{4})[\)\]]', row['name'])
+        meta = {"title": info.get('name') or title, "plot": info.get('plot') or info.get('description') or '',
+                "year": (info.get('releasedate') or info.get('release_date') or '')[:4] or (year.group(1) if year else ''),
+                "rating": info.get('rating') or '', "genre": info.get('genre') or '',
+                "thumb": info.get('movie_image') or info.get('cover_big') or '', "tmdb_id": str(info.get('tmdb_id') or '')}
+        complete = True
+        if self.tmdb_api_key: # TMDB aanvullen; bij een fout niet cachen zodat het later opnieuw geprobeerd wordt
+            if not meta["tmdb_id"]:
+                res = self._tmdb_call("search/movie", {"query": title, **({"year": meta["year"]} if meta["year"] else {})})
+                complete = self._tmdb_ok(res)
+                if complete and res.get('results'): meta["tmdb_id"] = str(res['results'][0]['id'])
+            if meta["tmdb_id"]:
+                details = self._tmdb_call(f"movie/{meta['tmdb_id']}")
+                if self._tmdb_ok(details):
+                    meta.update(title=details.get('title') or meta["title"], plot=details.get('overview') or meta["plot"],
+                                year=(details.get('release_date') or '')[:4] or meta["year"], rating=details.get('vote_average', meta["rating"]))
+                else: complete = False
+        if complete: self.vod_info_cache.put(key, added, meta)
+        return meta, "fetched"
+
+    def _write_movie_nfo(self, row, nfo_path, sources, writer):
+        """Schrijft movie.nfo voor één film; zonder metadata blijft een bestaand bestand staan."""
+        try:
+            meta, result = self._movie_metadata(row, sources)
+        except JobCancelled:
+            writer.manifest.keep_file(nfo_path)
+            raise
+        if meta is None:
+            writer.manifest.keep_file(nfo_path)
+            return result
+        field = lambda name: escape(str(meta.get(name, '')))
+        uniqueid = f'\n    <uniqueid type="tmdb" default="true">{field("tmdb_id")}</uniqueid>' if meta.get("tmdb_id") else ""
+        nfo_content = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>
+<movie>
+    <title>{field("title")}</title>
+    <plot>{field("plot")}</plot>
+    <year>{field("year")}</year>
+    <rating>{field("rating")}</rating>
+    <genre>{field("genre")}</genre>
+    <thumb>{field("thumb")}</thumb>{uniqueid}
+</movie>"""
+        writer.write(nfo_path, nfo_content)
+        return result
+
+    def _tmdb_call(self, endpoint, params={}):
+        key = self.tmdb_api_key
+        if not key: return None
+        self.check_cancelled()
+        try:
+            url = f"{TMDB_API_URL}/{endpoint}"
+            p = {**params, "api_key": key, "language": TMDB_LANGUAGE}
+            with self.metrics.phase("tmdb/rate_limit_wait"):
+                self.tmdb_limiter.acquire()
+            start, r = time.perf_counter(), None
+            try:
+                with self._host_slot(url).slot(self.check_cancelled) as outcome:
+                    r = self.http.get(url, params=p, timeout=5)
+                    outcome["seconds"], outcome["congested"] = r.elapsed.total_seconds(), response_retried(r)
+                    outcome["ok"] = not (r.status_code == 429 or r.status_code >= 500)
+            finally:
+                self.metrics.observe("tmdb", re.sub(r"/\d+", "/{id}", endpoint), time.perf_counter() - start,
+                                     len(r.content) if r is not None else 0, r is not None and r.ok, self._request_detail(params) or endpoint)
+            return r.json()
+        except JobCancelled: raise
+        except: return None
+
+    @staticmethod
+    def _tmdb_ok(res):
+        """True als een TMDB-response een geldig antwoord is (geen netwerk- of API-fout)."""
+        return isinstance(res, dict) and res.get('success', True) is not False and 'status_code' not in res
+
+    def _tmdb_search_tv(self, search_term, query_key):
+        """Zoekt het TMDB show-id voor een titel; ook 'niet gevonden' wordt gecachet."""
+        cached = self.tmdb_cache.get_search(query_key, self.tmdb_cache_ttl, self.tmdb_negative_ttl)
+        if cached is not TmdbCache.MISSING:
+            return cached
+        res = self._tmdb_call("search/tv", {"query": search_term})
+        if not self._tmdb_ok(res):
+            return None # Fout: niet cachen, volgende export opnieuw proberen
+        show_id = res['results'][0]['id'] if res.get('results') else None
+        self.tmdb_cache.put_search(query_key, show_id)
+        return show_id
+
+    def _tmdb_tv_details(self, show_id):
+        """Haalt de TMDB details van een serie op, uit de cache waar mogelijk."""
+        details = self.tmdb_cache.get_details(show_id, TMDB_LANGUAGE, self.tmdb_cache_ttl)
+        if details is not None:
+            return details
+        res = self._tmdb_call(f"tv/{show_id}")
+        if not self._tmdb_ok(res):
+            return None
+        self.tmdb_cache.put_details(show_id, TMDB_LANGUAGE, res)
+        return res
+
+    def _tmdb_lookup_tv(self, name):
+        """Geeft de TMDB details voor een serienaam, met cache en zonder dubbele gelijktijdige lookups."""
+        search_term = re.sub(r'[\(\[]\d{4}[\)\]]', '', name).strip()
+        query_key = f"{TMDB_LANGUAGE}|" + " ".join(search_term.casefold().split())
+        show_id = self._tmdb_flight.do(("search", query_key), lambda: self._tmdb_search_tv(search_term, query_key))
+        if show_id is None:
+            return None
+        return self._tmdb_flight.do(("tv", show_id), lambda: self._tmdb_tv_details(show_id))
+
+    @staticmethod
+    def _api_sources(catalog):
+        """API-url en inloggegevens per bron van een catalogus; een samengevoegde catalogus heeft er meerdere."""
+        return [(f"{server}/player_api.php", {"username": username, "password": password, "server": server})
+                for server, username, password in catalog.sources]
+
+    @instrumented("export_series")
+    def export_series_logic(self, base_dir, retry_failed=False, changes_only=False, dry_run=False):
+        """Orchestreert het exportproces voor series.
+
+        Hervat een onderbroken export, probeert met retry_failed alleen de mislukte opnieuw, of
+        vraagt met changes_only alleen get_series_info op voor series waarvan last_modified veranderde.
+        Met dry_run wordt alleen het plan (de seriemappen) gemaakt en teruggegeven, anders het aantal
+        fouten (mislukte series in het logboek en schrijffouten).
+        """
+        catalog, groups, titles = self._snapshot("series")
+        if not len(catalog): # Niet geladen: niets exporteren (en zeker niets opruimen)
+            self.log(self._('no_series_groups_warning'))
+            return
+        sources = self._api_sources(catalog)
+
+        manifest = ExportManifest(base_dir, "series")
+        with self.metrics.phase("export_series/plan"):
+            plan = self.plan_series(base_dir, catalog, groups, titles)
+        self._log_plan(plan, manifest)
+        if dry_run: return plan
+        series_dirs = {s.index: directory for directory, s, _ in plan.entries}
+        journal = ExportJournal(base_dir)
+        snapshot = SyncSnapshot(base_dir, "series")
+        selected = [s for _, s, _ in plan.ordered()] # Op map gesorteerd, voor de locality op schijf
+        stamps = {catalog.row_key(s.index): s['last_modified'] for s in selected}
+        # Nieuwe momentopname: begint bij de vorige en wordt per gelukte serie bijgewerkt
+        new_snapshot = {key: stamp for key, stamp in snapshot.items.items() if key in stamps}
+        if changes_only and not retry_failed:
+            delta = compute_delta(snapshot.items, stamps)
+            self._log_delta(delta)
+            for s in selected:
+                if catalog.row_key(s.index) in delta["unchanged"]: manifest.keep_dir(series_dirs[s.index])
+            selected = [s for s in selected if catalog.row_key(s.index) not in delta["unchanged"]]
+        if retry_failed:
+            series_to_process = [s for s in selected if catalog.row_key(s.index) in journal.failed]
+            for s in selected: # De rest blijft zoals het was
+                if catalog.row_key(s.index) not in journal.failed: manifest.keep_dir(series_dirs[s.index])
+        else:
+            series_to_process = [s for s in selected if catalog.row_key(s.index) not in journal.done]
+            if len(series_to_process) < len(selected): # Vorige export is onderbroken: ga verder waar die stopte
+                self.log(self._('export_series_resume', done=len(selected) - len(series_to_process), total=len(selected)))
+                for s in selected:
+                    if catalog.row_key(s.index) in journal.done:
+                        manifest.adopt_dir(series_dirs[s.index])
+                        new_snapshot[catalog.row_key(s.index)] = stamps[catalog.row_key(s.index)]
+        total_series = len(series_to_process)
+        self.log(self._('export_series_status', total=total_series))
+
+        # Series worden parallel verwerkt; tellers, voortgang en het logboek worden alleen hier
+        # (in de volgorde van afronden) bijgewerkt, dus geen lock nodig.
+        count_episodes = 0
+        finished = cancelled = False
+        try:
+            with OutputWriter(manifest, self.io_workers, self.metrics) as writer, ThreadPoolExecutor(max_workers=self.series_workers) as pool, \
+                    self.progress.phase("export_series", total_series):
+                futures = {pool.submit(self._process_single_series, s, series_dirs[s.index], sources, writer): s
+                           for s in series_to_process}
+                for index, future in enumerate(as_completed(futures)):
+                    s = futures[future]
+                    if self.cancel_event.is_set() and not cancelled: # Nog niet gestarte series niet meer beginnen
+                        cancelled = True
+                        for pending in futures: pending.cancel()
+                    if not future.cancelled():
+                        self.log(self._('export_series_progress', current=index + 1, total=total_series, name=s['name']))
+                    key = catalog.row_key(s.index)
+                    try:
+                        count_episodes += future.result()
+                        journal.mark_done(key)
+                        new_snapshot[key] = stamps[key]
+                        self.progress.advance(phase="export_series")
+                    except (JobCancelled, CancelledError): # Gestopt: deze serie blijft zoals hij was
+                        cancelled = True
+                        manifest.keep_dir(series_dirs[s.index])
+                    except requests.RequestException as e:
+                        self.progress.advance(errors=1, phase="export_series")
+                        manifest.keep_dir(series_dirs[s.index])
+                        journal.mark_failed(key, describe_error(e))
+                        new_snapshot.pop(key, None) # Volgende delta-sync opnieuw proberen
+                        self.log(f"Netwerkfout bij {s['name']}: {describe_error(e)}")
+                    except Exception as e: # Vang onverwachte fouten per serie
+                        self.progress.advance(errors=1, phase="export_series")
+                        manifest.keep_dir(series_dirs[s.index])
+                        journal.mark_failed(key, describe_error(e))
+                        new_snapshot.pop(key, None)
+                        self.log(f"Fout bij verwerken van {s['name']}: {describe_error(e)}")
+            finished = not cancelled # Gestopt: het logboek blijft staan zodat de volgende run verdergaat
+        finally:
+            journal.close(finished)
+            if catalog.complete: snapshot.save(new_snapshot)
+
+        if not catalog.complete: self.log(self._('export_incomplete_load'))
+        with self.metrics.phase("export_series/finish"):
+            # Bij alleen-mislukte of gestopt niet opruimen: de overige series zijn niet opnieuw bekeken
+            summary = self._finish_manifest(manifest, writer, allow_prune=not retry_failed and not cancelled, save=catalog.complete)
+        if cancelled: raise JobCancelled() # Logboek, manifest en momentopname zijn bijgewerkt; de scheduler meldt het stoppen
+        self.log(f"{self._('export_series_done', episodes=count_episodes, series=total_series)} {summary}")
+        if journal.failed:
+            self.log(self._('export_series_failed', count=len(journal.failed)))
+        return len(journal.failed) + writer.errors
+
+    def _series_dir(self, base_dir, series_data):
+        """Geeft de map waarin een serie wordt geëxporteerd."""
+        return os.path.join(base_dir, self.sanitize_filename(series_data['group']), self.sanitize_filename(series_data['name']))
+
+    def _process_single_series(self, series_data, series_dir, sources, writer):
+        """Haalt info en afleveringen voor één serie op en schrijft de bestanden in series_dir."""
+        info_response = None
+        for source, series_id, _ in series_data['candidates']: # Voorkeursprovider eerst, dan de andere
+            api_url, auth = sources[source]
+            info_response = series_data.catalog.local_series_info(source, series_id) # Series uit een M3U-playlist
+            if info_response is None:
+                info_response = self._api_get(api_url, {**auth, "action": "get_series_info", "series_id": series_id})
+            if info_response: break
+        if not info_response: # Netwerk- of providerfout, of een leeg antwoord van een overbelast panel: als mislukt in het logboek zetten
+            raise requests.RequestException("geen of leeg antwoord op get_series_info")
+        if 'episodes' not in info_response:
+            writer.manifest.keep_dir(series_dir) # Geen afleveringen: bestaande bestanden niet als verouderd zien
+            return 0
+
+        episodes_data = info_response['episodes'] or {}
+        provider_info = info_response.get('info', {})
+        
+        series_name = self.sanitize_filename(series_data['name'])
+        episode_count = 0
+        with writer.batch(): # Pas klaar (en zo in het logboek) als alle bestanden op schijf staan
+            self._create_tvshow_nfo(series_dir, series_data, provider_info, writer)
+            for season_num, ep_list in episodes_data.items():
+                for ep in ep_list:
+                    self._create_episode_files(series_dir, series_name, season_num, ep, auth, writer)
+                    episode_count += 1
+        return episode_count
+
+    def _create_tvshow_nfo(self, series_dir, series_data, provider_info, writer):
+        """Maakt het tvshow.nfo bestand, met TMDB als prioriteit."""
+        nfo_path = os.path.join(series_dir, "tvshow.nfo")
+        
+        # Probeer eerst TMDB data te gebruiken voor betere metadata
+        if self.tmdb_api_key:
+            details = self._tmdb_lookup_tv(series_data['name'])
+            if details:
+                field = lambda name: escape(str(details.get(name, '')))
+                nfo_content = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>
+<tvshow>
+    <title>{field('name')}</title>
+    <plot>{field('overview')}</plot>
+    <premiered>{field('first_air_date')}</premiered>
+    <rating>{field('vote_average')}</rating>
+</tvshow>"""
+                writer.write(nfo_path, nfo_content)
+                return # Stop hier als TMDB succesvol was
+
+        # Fallback naar de data van de provider als TMDB faalt of niet is ingesteld
+        field = lambda name: escape(str(provider_info.get(name, '')))
+        nfo_content = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>
+<tvshow>
+    <title>{escape(series_data['name'])}</title>
+    <plot>{field('plot')}</plot>
+    <genre>{field('genre')}</genre>
+    <rating>{field('rating')}</rating>
+    <thumb>{field('cover')}</thumb>
+</tvshow>"""
+        writer.write(nfo_path, nfo_content)
+
+    def _create_episode_files(self, series_dir, series_name, season_num, ep_data, auth, writer):
+        """Maakt de .strm en .nfo bestanden voor een enkele aflevering."""
+        try:
+            season_folder = f"Season {int(season_num):02d}"
+            full_dir = os.path.join(series_dir, season_folder)
+
+            ep_num = ep_data.get('episode_num')
+            ext = ep_data.get('container_extension', 'mp4')
+            ep_id = ep_data.get('id')
+            
+            # Haal server, user, pass uit auth dict voor de URL
+            server = auth['server'].rstrip('/')
+            username = auth['username']
+            password = auth['password']
+
+            filename_base = f"{series_name} - S{int(season_num):02d}E{int(ep_num):02d}"
+            stream_url = ep_data.get('url') or f"{server}/series/{username}/{password}/{ep_id}.{ext}"
+            
+            # .strm bestand
+            writer.write(os.path.join(full_dir, filename_base + ".strm"), stream_url)
+            
+            # .nfo voor aflevering
+            info = ep_data.get('info', {})
+            nfo_content = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>
+<episodedetails>
+    <title>{escape(str(ep_data.get('title', '')))}</title>
+    <plot>{escape(str(info.get('plot', '')))}</plot>
+    <season>{escape(str(season_num))}</season>
+    <episode>{escape(str(ep_num))}</episode>
+    <thumb>{escape(str(info.get('movie_image', '')))}</thumb>
+</episodedetails>"""
+            writer.write(os.path.join(full_dir, filename_base + ".nfo"), nfo_content)
+
+        except TypeError: # Vang fouten zoals int(None); schrijffouten telt de writer
+            pass
+
+
+# --- CLI ---
+def run_sync_cli(argv=None):
+    """Headless sync: laadt de catalogus en exporteert de in config.json geselecteerde groepen."""
+    parser = argparse.ArgumentParser(prog="strm_manager.py sync",
+                                     description="Laadt de catalogus van een provider en exporteert de in config.json geselecteerde groepen en titels, zonder GUI.")
+    parser.add_argument("--provider", help="naam van de provider (standaard de laatst gebruikte)")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="pad naar config.json")
+    parser.add_argument("--out", help="doelmap: films in Movies/, series in Series/ en live in live.m3u")
+    parser.add_argument("--live", action="store_true", help="exporteer de geselecteerde Live TV groepen als M3U")
+    parser.add_argument("--movies", action="store_true", help="exporteer de geselecteerde filmgroepen")
+    parser.add_argument("--series", action="store_true", help="exporteer de geselecteerde seriegroepen")
+    parser.add_argument("--m3u", help="pad van het M3U-bestand (overschrijft --out)")
+    parser.add_argument("--movies-dir", help="doelmap voor films (overschrijft --out)")
+    parser.add_argument("--series-dir", help="doelmap voor series (overschrijft --out)")
+    parser.add_argument("--merge", action="store_true", help="laad alle providers tegelijk en voeg ze samen (volgorde in config.json = prioriteit)")
+    parser.add_argument("--changes-only", action="store_true", help="exporteer alleen nieuwe en gewijzigde films en series sinds de vorige export")
+    parser.add_argument("--retry-failed", action="store_true", help="probeer alleen de series die bij de vorige export mislukten opnieuw")
+    parser.add_argument("--epg", action="store_true", help="schrijf bij --live een gefilterde XMLTV-gids naast de M3U")
+    parser.add_argument("--movie-nfo", action="store_true", help="schrijf bij --movies per film een movie.nfo (get_vod_info, TMDB)")
+    parser.add_argument("--dry-run", action="store_true", help="toon alleen het plan voor --movies en --series (en botsingen); er wordt niets geschreven")
+    args = parser.parse_args(argv)
+
+    if not (args.live or args.movies or args.series):
+        parser.error("kies minstens een van --live, --movies of --series")
+    targets = {
+        "live": args.m3u or (args.out and os.path.join(args.out, "live.m3u")),
+        "movies": args.movies_dir or (args.out and os.path.join(args.out, "Movies")),
+        "series": args.series_dir or (args.out and os.path.join(args.out, "Series")),
+    }
+    for type_key in ("live", "movies", "series"):
+        if getattr(args, type_key) and not targets[type_key]:
+            parser.error(f"geen doel voor --{type_key}: geef --out op")
+
+    engine = StrmEngine(args.config)
+    engine.load_config()
+    if args.provider: engine.current_provider = args.provider
+    if args.merge: engine.merge_providers = True
+    if args.epg: engine.export_epg = True
+    if args.movie_nfo: engine.movie_nfo = True
+    if not engine._providers_to_load():
+        print(engine._('no_provider_warning'), file=sys.stderr)
+        return 2
+
+    stop_progress = threading.Event()
+    threading.Thread(target=print_progress, args=(engine.progress, stop_progress, engine.format_progress), daemon=True).start()
+    try:
+        try:
+            loaded = engine.load_from_xtream()
+        except requests.RequestException: # Bij samenvoegen kon geen enkele provider laden (al gemeld)
+            loaded = False
+        if not loaded or not (len(engine.streams_live) or len(engine.streams_movies) or len(engine.streams_series)):
+            # Mislukt, onvolledig of leeg: niet exporteren, anders lijkt de bibliotheek leeg
+            print(engine._('cli_load_failed'), file=sys.stderr)
+            return 1
+        if args.dry_run:
+            plans = {"movies": args.movies and engine.has_selection("movies") and engine.export_movies_logic(targets["movies"], dry_run=True),
+                     "series": args.series and engine.has_selection("series") and engine.export_series_logic(targets["series"], dry_run=True)}
+            for type_key, plan in plans.items():
+                for line in plan.lines() if plan else ():
+                    print(f"{type_key}: {line}")
+            return 0
+        if args.live:
+            if engine.selected_live:
+                os.makedirs(os.path.dirname(os.path.abspath(targets["live"])), exist_ok=True)
+                engine.export_live_logic(targets["live"])
+            else: engine.log(engine._('no_live_groups_warning'))
+        errors = 0
+        if args.movies:
+            if engine.has_selection("movies"): errors += engine.export_movies_logic(targets["movies"], changes_only=args.changes_only) or 0
+            else: engine.log(engine._('no_movie_groups_warning'))
+        if args.series:
+            if engine.has_selection("series"): errors += engine.export_series_logic(targets["series"], retry_failed=args.retry_failed, changes_only=args.changes_only) or 0
+            else: engine.log(engine._('no_series_groups_warning'))
+    finally:
+        stop_progress.set()
+        engine.close()
+    if errors:
+        print(engine._('cli_export_failed', count=errors), file=sys.stderr)
+        return 1
+    return 0
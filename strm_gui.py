@@ -0,0 +1,650 @@
+"""Tkinter GUI van STRM Manager; de laad- en exportlogica zit in strm_core."""
+# pylint: disable=too-many-instance-attributes, too-many-locals, too-many-arguments
+# pylint: disable=broad-exception-caught, line-too-long, unspecified-encoding
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import time
+import traceback
+
+from strm_core import LANGUAGES, ExportJournal, JobScheduler, ProgressBus, StrmEngine
+
+FRAME_INTERVAL_MS = 100 # Ritme waarop de UI voortgang en statusmeldingen ophaalt
+
+
+class StrmManagerApp:
+    """De hoofdapplicatie voor het beheren van STRM-bestanden van Xtream Codes."""
+    def __init__(self, root):
+        self.root = root
+        self.root.geometry("1100x750")
+
+        # Alle data (catalogus, selecties, providers, caches) zit in de engine. Meldingen en voortgang
+        # van de workers gaan via de ProgressBus en worden op een vast ritme door de UI opgehaald.
+        self.progress_bus = ProgressBus()
+        self.engine = StrmEngine(log=self.log, progress=self.progress_bus)
+        self.engine.on_catalog_loaded = lambda type_key: self.root.after(0, self._update_ui_column, type_key)
+        # Laden en exporteren lopen via één wachtrij, zodat ze nooit tegelijk de catalogus gebruiken
+        self.scheduler = JobScheduler(self.engine, on_start=lambda job: self.root.after(0, self.set_busy, True),
+                                      on_finish=self._on_job_finished)
+
+        # UI Variabelen
+        self.current_provider_name = tk.StringVar()
+        self.tmdb_api_key = tk.StringVar()
+        self.lang_var = tk.StringVar()
+        self.merge_var = tk.BooleanVar()
+        self.changes_only_var = tk.BooleanVar()
+        self.epg_var = tk.BooleanVar()
+        self.movie_nfo_var = tk.BooleanVar()
+        self.dry_run_var = tk.BooleanVar()
+
+        self._setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.load_config()
+        self.root.after(100, self.start_cached_startup)
+        self.root.after(FRAME_INTERVAL_MS, self._render_progress)
+
+    def _setup_ui(self):
+        # --- Bovenbalk ---
+        self.frame_top = tk.LabelFrame(self.root, pady=5, padx=10)
+        self.frame_top.pack(fill=tk.X, padx=10, pady=5)
+
+        # Taal selectie
+        frame_lang = tk.Frame(self.frame_top)
+        frame_lang.pack(fill=tk.X, expand=True, pady=2)
+        self.lbl_lang = tk.Label(frame_lang, width=12, anchor='w')
+        self.lbl_lang.pack(side=tk.LEFT)
+        self.lang_menu = ttk.Combobox(frame_lang, textvariable=self.lang_var, values=list(LANGUAGES.keys()), state="readonly")
+        self.lang_menu.pack(side=tk.LEFT, padx=5)
+        self.lang_var.trace_add('write', self.change_language)
+
+        # Provider selectie
+        frame_inputs = tk.Frame(self.frame_top)
+        frame_inputs.pack(fill=tk.X, expand=True, pady=2)
+
+        self.lbl_provider = tk.Label(frame_inputs, width=12, anchor='w')
+        self.lbl_provider.grid(row=0, column=0, sticky='w')
+        self.combo_providers = ttk.Combobox(frame_inputs, textvariable=self.current_provider_name, state="readonly")
+        self.combo_providers.grid(row=0, column=1, sticky='ew', padx=5)
+        
+        self.btn_manage = tk.Button(frame_inputs, command=self.open_provider_manager)
+        self.btn_manage.grid(row=0, column=2, padx=5)
+        self.chk_merge = tk.Checkbutton(frame_inputs, variable=self.merge_var)
+        self.chk_merge.grid(row=0, column=3, padx=5)
+        self.btn_search = tk.Button(frame_inputs, command=self.open_title_search)
+        self.btn_search.grid(row=0, column=4, padx=5)
+
+        frame_inputs.grid_columnconfigure(1, weight=1)
+
+        # TMDB Key
+        frame_api = tk.Frame(self.frame_top)
+        frame_api.pack(fill=tk.X, expand=True, pady=2)
+        self.lbl_tmdb = tk.Label(frame_api, width=12, anchor='w')
+        self.lbl_tmdb.pack(side=tk.LEFT)
+        tk.Entry(frame_api, textvariable=self.tmdb_api_key).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.chk_changes_only = tk.Checkbutton(frame_api, variable=self.changes_only_var)
+        self.chk_changes_only.pack(side=tk.LEFT, padx=5)
+        self.chk_epg = tk.Checkbutton(frame_api, variable=self.epg_var)
+        self.chk_epg.pack(side=tk.LEFT, padx=5)
+        self.chk_movie_nfo = tk.Checkbutton(frame_api, variable=self.movie_nfo_var)
+        self.chk_movie_nfo.pack(side=tk.LEFT, padx=5)
+        self.chk_dry_run = tk.Checkbutton(frame_api, variable=self.dry_run_var)
+        self.chk_dry_run.pack(side=tk.LEFT, padx=5)
+        
+        # Load knop
+        self.btn_load = tk.Button(self.frame_top, command=self.start_load_from_xtream, bg="#dddddd", height=2)
+        self.btn_load.pack(fill=tk.X, pady=(10, 0))
+
+        # --- Midden: 3 Kolommen ---
+        frame_middle = tk.Frame(self.root)
+        frame_middle.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        frame_middle.grid_columnconfigure(0, weight=1)
+        frame_middle.grid_columnconfigure(1, weight=1)
+        frame_middle.grid_columnconfigure(2, weight=1)
+        frame_middle.grid_rowconfigure(0, weight=1)
+
+        # 1. LIVE
+        self.frame_live, self.list_live = self._create_category_frame(frame_middle, 0, "#e6f2ff", lambda: self.engine.selected_live)
+        self.btn_export_live, self.btn_clear_live = self._add_action_buttons(self.frame_live, self.start_export_live, "live")
+
+        # 2. FILMS
+        self.frame_movies, self.list_movies = self._create_category_frame(frame_middle, 1, "#e6ffe6", lambda: self.engine.selected_movies)
+        self.btn_export_movies, self.btn_clear_movies = self._add_action_buttons(self.frame_movies, self.start_export_movies, "movies")
+
+        # 3. SERIES
+        self.frame_series, self.list_series = self._create_category_frame(frame_middle, 2, "#fff0e6", lambda: self.engine.selected_series)
+        self.btn_export_series, self.btn_clear_series = self._add_action_buttons(self.frame_series, self.start_export_series, "series")
+
+        # --- Onderbalk ---
+        self.frame_bottom = tk.LabelFrame(self.root, padx=10, pady=5)
+        self.frame_bottom.pack(fill=tk.X, padx=10, pady=10)
+
+        self.lbl_status = tk.Label(self.frame_bottom, fg="blue", anchor="w")
+        self.lbl_status.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.progress = ttk.Progressbar(self.frame_bottom, mode="indeterminate", length=200)
+        self.progress.pack(side=tk.RIGHT, padx=10)
+        self.lbl_progress = tk.Label(self.frame_bottom, anchor="e")
+        self.lbl_progress.pack(side=tk.RIGHT)
+        self.btn_cancel = tk.Button(self.frame_bottom, command=self.scheduler.cancel, state=tk.DISABLED)
+        self.btn_cancel.pack(side=tk.RIGHT, padx=5)
+        self._busy = False
+
+    def _create_category_frame(self, parent, col, bg_color, get_selected):
+        container = tk.LabelFrame(parent, padx=5, pady=5, bg=bg_color)
+        container.grid(row=0, column=col, sticky='nsew', padx=5)
+        return container, CategoryList(container, get_selected)
+
+    def _add_action_buttons(self, parent, export_cmd, type_key):
+        btn_frame = tk.Frame(parent)
+        btn_frame.pack(fill=tk.X, pady=5)
+        
+        btn_export = tk.Button(btn_frame, command=export_cmd, font=("Arial", 9, "bold"))
+        btn_export.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        btn_clear = tk.Button(btn_frame, command=lambda: self.clear_selection(type_key), font=("Arial", 8))
+        btn_clear.pack(side=tk.LEFT, padx=2)
+        return btn_export, btn_clear
+
+    def _(self, key, **kwargs):
+        """Vertaalt een key naar de huidige taal, met optionele placeholders."""
+        return self.engine._(key, **kwargs)
+
+    def change_language(self, *args):
+        new_lang = self.lang_var.get()
+        if new_lang != self.engine.current_lang:
+            self.engine.current_lang = new_lang
+            self.update_ui_text()
+
+    def update_ui_text(self):
+        """Werkt alle teksten in de UI bij naar de huidige taal."""
+        self.root.title(self._('app_title'))
+        self.frame_top.config(text=self._('settings_frame'))
+        self.lbl_lang.config(text=self._('language_label'))
+        self.lbl_provider.config(text=self._('provider_label'))
+        self.btn_manage.config(text=self._('manage_accounts_button'))
+        self.chk_merge.config(text=self._('merge_providers_label'))
+        self.btn_search.config(text=self._('search_titles_button'))
+        self.chk_changes_only.config(text=self._('changes_only_label'))
+        self.chk_epg.config(text=self._('export_epg_label'))
+        self.chk_movie_nfo.config(text=self._('movie_nfo_label'))
+        self.chk_dry_run.config(text=self._('dry_run_label'))
+        self.lbl_tmdb.config(text=self._('tmdb_api_key_label'))
+        self.btn_load.config(text=self._('load_list_button'))
+        self.frame_live.config(text=self._('live_tv_frame'))
+        self.frame_movies.config(text=self._('movies_frame'))
+        self.frame_series.config(text=self._('series_frame'))
+        self.btn_export_live.config(text=self._('export_m3u_button'))
+        self.btn_export_movies.config(text=self._('create_movies_button'))
+        self.btn_export_series.config(text=self._('create_series_button'))
+        for btn in [self.btn_clear_live, self.btn_clear_movies, self.btn_clear_series]:
+            btn.config(text=self._('clear_selection_button'))
+        for category_list in [self.list_live, self.list_movies, self.list_series]:
+            category_list.lbl_filter.config(text=self._('filter_label'))
+            category_list.btn_select_matching.config(text=self._('select_matching_button'))
+        self.frame_bottom.config(text=self._('status_frame'))
+        self.btn_cancel.config(text=self._('cancel_button'))
+        self.lbl_status.config(text=self._('ready_status'))
+
+    # --- HULP FUNCTIES ---
+    def log(self, message):
+        self.progress_bus.message(message) # Thread-veilig; getoond bij het volgende frame
+
+    def _render_progress(self):
+        """Haalt per frame de nieuwe meldingen en de actuele fase op; alleen de laatste stand wordt getoond."""
+        messages, state = self.progress_bus.drain()
+        if messages:
+            self.lbl_status.config(text=messages[-1])
+        if self._busy and state and state['total']:
+            if str(self.progress['mode']) != "determinate":
+                self.progress.stop()
+                self.progress.config(mode="determinate", maximum=state['total'])
+            self.progress.config(maximum=state['total'], value=state['done'])
+        elif self._busy and str(self.progress['mode']) != "indeterminate":
+            self.progress.config(mode="indeterminate", value=0)
+            self.progress.start(10)
+        self.lbl_progress.config(text=self.engine.format_progress(state) if self._busy and state else "")
+        self.root.after(FRAME_INTERVAL_MS, self._render_progress)
+
+    def set_busy(self, busy):
+        self._busy = busy
+        state = tk.DISABLED if busy else tk.NORMAL
+        self.btn_load.config(state=state)
+        self.btn_cancel.config(state=tk.NORMAL if busy else tk.DISABLED)
+        if busy:
+            self.progress.config(mode="indeterminate", value=0)
+            self.progress.start(10)
+        else:
+            self.progress.stop()
+            self.progress.config(mode="determinate", value=0)
+
+    def run_job(self, name, func):
+        """Zet een laad- of exportjob in de wachtrij van de scheduler."""
+        self._sync_to_engine()
+        if self.scheduler.current or self.scheduler.pending:
+            self.log(self._('job_queued', name=name, count=self.scheduler.pending + 1))
+        self.scheduler.submit(name, func)
+
+    def _on_job_finished(self, job):
+        """Draait op de schedulerthread: meldt fouten en zet de UI terug als de rij leeg is."""
+        if job.error:
+            e = job.error
+            self.log(f"Onverwachte Fout: {e}")
+            # Print volledige error naar console voor debugging
+            traceback.print_exception(type(e), e, e.__traceback__) # Keep for debugging
+            self.root.after(0, lambda: messagebox.showerror("Fout in achtergrondtaak", f"Er is een fout opgetreden:\n\n{e}"))
+        if not self.scheduler.pending:
+            self.root.after(0, self.set_busy, False)
+
+    def _sync_to_engine(self):
+        """Zet de waarden uit de UI (provider, TMDB key) over naar de engine; de vinkjes staan al in de engine-sets."""
+        self.engine.current_provider = self.current_provider_name.get()
+        self.engine.tmdb_api_key = self.tmdb_api_key.get()
+        self.engine.merge_providers = self.merge_var.get()
+        self.engine.export_epg = self.epg_var.get()
+        self.engine.movie_nfo = self.movie_nfo_var.get()
+
+    # --- CONFIG ---
+    def load_config(self):
+        self.engine.load_config()
+        self.lang_var.set(self.engine.current_lang) # Zorg dat de UI consistent is
+        self.tmdb_api_key.set(self.engine.tmdb_api_key)
+        self.merge_var.set(self.engine.merge_providers)
+        self.epg_var.set(self.engine.export_epg)
+        self.movie_nfo_var.set(self.engine.movie_nfo)
+        self.combo_providers['values'] = [p['name'] for p in self.engine.providers]
+        if self.engine.current_provider:
+            self.current_provider_name.set(self.engine.current_provider)
+        self.update_ui_text() # Pas taal toe na laden
+
+    def save_config(self):
+        self._sync_to_engine()
+        self.engine.save_config()
+
+    def on_close(self):
+        self.save_config()
+        self.scheduler.close()
+        self.engine.close()
+        self.root.destroy()
+
+    # --- XTREAM CODES LOGICA ---
+    def start_load_from_xtream(self):
+        self.run_job(self._('load_list_button'), self.engine.load_from_xtream)
+
+    def start_cached_startup(self):
+        """Toont bij het opstarten direct de laatst bekende catalogus en ververst verlopen delen op de achtergrond."""
+        self._sync_to_engine()
+        stale = self.engine.cached_catalog_state()
+        if stale is None: return # Nog geen (volledige) cache
+        def task():
+            self.engine.load_from_xtream(cache_only=True)
+            if stale:
+                self.log(self._('cache_loaded_status'))
+                self.engine.load_from_xtream()
+        self.run_job(self._('load_list_button'), task)
+
+    def _category_list(self, type_key):
+        return {"live": self.list_live, "movies": self.list_movies, "series": self.list_series}[type_key]
+
+    def _update_ui_column(self, type_key):
+        """Vult één kolom (live, movies of series) met de categorieën van de geladen catalogus."""
+        self._category_list(type_key).set_catalog(getattr(self.engine, f"streams_{type_key}"))
+
+    def clear_selection(self, type_key):
+        self._category_list(type_key).get_selected().clear()
+        self._category_list(type_key).redraw()
+
+    # --- EXPORT FUNCTIES ---
+    def start_export_live(self):
+        if not self.engine.selected_live: return messagebox.showwarning("Let op", self._('no_live_groups_warning'))
+        path = filedialog.asksaveasfilename(defaultextension=".m3u", filetypes=[("M3U Playlist", "*.m3u")])
+        if path: self.run_job(self._('export_m3u_button'), lambda: self.engine.export_live_logic(path))
+
+    def start_export_movies(self):
+        if not self.engine.has_selection("movies"): return messagebox.showwarning("Let op", self._('no_movie_groups_warning'))
+        path = filedialog.askdirectory(title=self._('ask_movie_dir_title'))
+        changes_only, dry_run = self.changes_only_var.get(), self.dry_run_var.get()
+        if path: self.run_job(self._('create_movies_button'), lambda: self.engine.export_movies_logic(path, changes_only=changes_only, dry_run=dry_run))
+
+    def start_export_series(self):
+        if not self.engine.has_selection("series"): return messagebox.showwarning("Let op", self._('no_series_groups_warning'))
+        path = filedialog.askdirectory(title=self._('ask_series_dir_title'))
+        if not path: return
+        journal = ExportJournal(path)
+        retry = bool(journal.failed) and not journal.done and messagebox.askyesno(
+            self._('create_series_button'), self._('retry_failed_question', count=len(journal.failed)))
+        changes_only, dry_run = self.changes_only_var.get(), self.dry_run_var.get()
+        self.run_job(self._('create_series_button'), lambda: self.engine.export_series_logic(path, retry_failed=retry, changes_only=changes_only, dry_run=dry_run))
+
+    # --- PROVIDER MANAGER POPUP ---
+    def open_provider_manager(self):
+        manager = ProviderManager(self.root, self.engine.providers, self.engine.encrypt_pass)
+        if manager.saved_providers is not None:
+            self.engine.providers = manager.saved_providers
+            self.combo_providers['values'] = [p['name'] for p in self.engine.providers]
+            if self.current_provider_name.get() not in [p['name'] for p in self.engine.providers]:
+                self.current_provider_name.set("")
+
+    # --- TITELS ZOEKEN POPUP ---
+    def open_title_search(self):
+        TitleSearch(self.root, self.engine)
+
+
+class CategoryList:
+    """Filterbare lijst met categorieën die alleen de zichtbare rijen op een canvas tekent.
+
+    Er wordt geen widget of BooleanVar per categorie gemaakt; de vinkjes staan direct in
+    de selectie-set die `get_selected` teruggeeft (bv. engine.selected_movies).
+    """
+    ROW_HEIGHT = 20
+
+    def __init__(self, parent, get_selected):
+        self.get_selected = get_selected
+        self.catalog = None
+        self.groups = []    # Alle categorieën, gesorteerd
+        self.visible = []   # Categorieën die aan het zoekfilter voldoen
+        self._folded = {}   # Categorie -> casefold() voor het filteren
+        self._query = None
+
+        frame = tk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        filter_row = tk.Frame(frame)
+        filter_row.pack(fill=tk.X, pady=(0, 3))
+        self.lbl_filter = tk.Label(filter_row)
+        self.lbl_filter.pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', self._on_filter)
+        tk.Entry(filter_row, textvariable=self.filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=3)
+        self.btn_select_matching = tk.Button(filter_row, command=self.select_matching, font=("Arial", 8))
+        self.btn_select_matching.pack(side=tk.LEFT)
+
+        list_frame = tk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(list_frame, bg="white", highlightthickness=0, yscrollincrement=self.ROW_HEIGHT)
+        scrollbar = tk.Scrollbar(list_frame, orient="vertical", command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll(-1)) # Linux
+        self.canvas.bind("<Button-5>", lambda e: self._scroll(1))
+
+    def set_catalog(self, catalog):
+        """Toont de categorieën van een (nieuw geladen) catalogus; het huidige zoekfilter blijft staan."""
+        self.catalog = catalog
+        self.groups = sorted(set(catalog.groups))
+        self._folded = {g: g.casefold() for g in self.groups}
+        self._query = None
+        self._on_filter()
+
+    def _on_filter(self, *args):
+        query = self.filter_var.get().strip().casefold()
+        # Bij doortypen hoeft alleen de vorige (kleinere) resultatenlijst doorzocht te worden
+        source = self.visible if self._query and query.startswith(self._query) else self.groups
+        self.visible = [g for g in source if query in self._folded[g]] if query else list(self.groups)
+        self._query = query
+        self.canvas.yview_moveto(0)
+        self.redraw()
+
+    def select_matching(self):
+        """Vinkt alle categorieën aan die aan het zoekfilter voldoen."""
+        self.get_selected().update(self.visible)
+        self.redraw()
+
+    def redraw(self):
+        """Tekent alleen de rijen die op dit moment in beeld zijn."""
+        canvas, row_h = self.canvas, self.ROW_HEIGHT
+        canvas.delete("row")
+        canvas.configure(scrollregion=(0, 0, canvas.winfo_width(), len(self.visible) * row_h))
+        top = int(canvas.canvasy(0))
+        first = max(0, top // row_h)
+        last = min(len(self.visible), (top + canvas.winfo_height()) // row_h + 1)
+        selected = self.get_selected()
+        for i in range(first, last):
+            group, y = self.visible[i], i * row_h
+            checked = group in selected
+            canvas.create_rectangle(4, y + 4, 16, y + 16, outline="#666666", fill="#3b7ddd" if checked else "white", tags="row")
+            if checked:
+                canvas.create_text(10, y + 10, text="\u2713", fill="white", font=("Arial", 8, "bold"), tags="row")
+            canvas.create_text(22, y + row_h // 2, text=f"{group} ({self.catalog.group_count(group)})", anchor='w', tags="row")
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def _scroll(self, rows):
+        self.canvas.yview_scroll(rows * 3, "units")
+        self.redraw()
+
+    def _on_click(self, event):
+        index = int(self.canvas.canvasy(event.y)) // self.ROW_HEIGHT
+        if 0 <= index < len(self.visible):
+            selected, group = self.get_selected(), self.visible[index]
+            if group in selected: selected.discard(group)
+            else: selected.add(group)
+            self.redraw()
+
+
+class TitleSearch:
+    """Een apart venster om films en series op titel te zoeken en los te selecteren.
+
+    Zoekt bij elke toetsaanslag in de TitleIndex van de engine; de vinkjes staan direct
+    in engine.selected_titles en worden met de rest van de config bewaard.
+    """
+    def __init__(self, parent, engine):
+        self.engine = engine
+        self._ = engine._
+        self.results = [] # (type_key, StreamRow) per regel in de lijst
+        self.elapsed_ms = 0.0
+
+        self.top = tk.Toplevel(parent)
+        self.top.title(self._('title_search_window'))
+        self.top.geometry("700x450")
+        self.top.transient(parent)
+        self.top.grab_set()
+
+        frame = tk.Frame(self.top, padx=10, pady=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.query_var = tk.StringVar()
+        entry = tk.Entry(frame, textvariable=self.query_var)
+        entry.pack(fill=tk.X)
+        entry.bind("<Down>", self._focus_list)
+        tk.Label(frame, text=self._('title_search_hint'), anchor='w', fg="#666666").pack(fill=tk.X, pady=3)
+
+        list_frame = tk.Frame(frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.listbox = tk.Listbox(list_frame, exportselection=False, activestyle="none")
+        scrollbar = tk.Scrollbar(list_frame, orient="vertical", command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=scrollbar.set)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.bind("<Double-Button-1>", self.toggle)
+        self.listbox.bind("<space>", self.toggle)
+
+        bottom = tk.Frame(frame)
+        bottom.pack(fill=tk.X, pady=(5, 0))
+        self.lbl_count = tk.Label(bottom, anchor='w')
+        self.lbl_count.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Button(bottom, text=self._('close_button'), command=self.top.destroy).pack(side=tk.RIGHT)
+
+        self.query_var.trace_add('write', self.refresh)
+        self.refresh()
+        entry.focus_set()
+        self.top.wait_window()
+
+    def _line(self, type_key, row):
+        key = row.catalog.row_key(row.index)
+        mark = "\u2714" if key in self.engine.selected_titles[type_key] else "   "
+        return f"{mark} [{self._('kind_' + type_key)}] {row['name']} ({row['group']})"
+
+    def refresh(self, *args):
+        """Toont de zoekresultaten, of bij een leeg zoekveld de los geselecteerde titels."""
+        query = self.query_var.get().strip()
+        start = time.perf_counter()
+        if query:
+            self.results = [(type_key, row) for _, type_key, row in self.engine.search_titles(query)]
+        else:
+            self.results = [(type_key, row) for type_key in ("movies", "series") for row in self.engine.selected_title_rows(type_key)]
+        self.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.listbox.delete(0, tk.END)
+        if self.results:
+            self.listbox.insert(tk.END, *(self._line(type_key, row) for type_key, row in self.results))
+        self._update_count()
+
+    def _update_count(self):
+        if not self.engine.title_index:
+            return self.lbl_count.config(text=self._('title_search_not_loaded'))
+        selected = sum(len(keys) for keys in self.engine.selected_titles.values())
+        self.lbl_count.config(text=self._('title_search_count', shown=len(self.results), ms=self.elapsed_ms, selected=selected))
+
+    def _focus_list(self, event=None):
+        if not self.results: return
+        self.listbox.focus_set()
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(0)
+        self.listbox.activate(0)
+
+    def toggle(self, event=None):
+        """Zet de gekozen titel(s) aan of uit; de regel wordt ter plekke bijgewerkt."""
+        for i in self.listbox.curselection():
+            type_key, row = self.results[i]
+            self.engine.toggle_title(type_key, row)
+            self.listbox.delete(i)
+            self.listbox.insert(i, self._line(type_key, row))
+            self.listbox.selection_set(i)
+            self.listbox.activate(i)
+        self._update_count()
+        return "break"
+
+
+class ProviderManager:
+    """Een apart venster voor het beheren van provider-accounts."""
+    PROVIDER_TYPES = {"xtream": "Xtream Codes", "m3u": "M3U playlist"}
+
+    def __init__(self, parent, providers, encrypt_func):
+        self.top = tk.Toplevel(parent)
+        self.top.title("Provider Beheer")
+        self.top.geometry("600x350")
+        self.top.transient(parent)
+        self.top.grab_set()
+
+        self.providers = [p.copy() for p in providers]
+        self.encrypt_func = encrypt_func
+        self.saved_providers = None
+
+        # --- UI ---
+        list_frame = tk.Frame(self.top, padx=10, pady=10)
+        list_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.listbox = tk.Listbox(list_frame, exportselection=False)
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        self.listbox.bind('<<ListboxSelect>>', self.on_select)
+
+        btn_list_frame = tk.Frame(list_frame)
+        btn_list_frame.pack(fill=tk.X, pady=5)
+        tk.Button(btn_list_frame, text="Nieuw", command=self.new_provider).pack(side=tk.LEFT)
+        tk.Button(btn_list_frame, text="Verwijder", command=self.delete_provider).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_list_frame, text="\u25b2", command=lambda: self.move_provider(-1)).pack(side=tk.LEFT)
+        tk.Button(btn_list_frame, text="\u25bc", command=lambda: self.move_provider(1)).pack(side=tk.LEFT, padx=5)
+
+        details_frame = tk.LabelFrame(self.top, text="Details", padx=10, pady=10)
+        details_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
+
+        tk.Label(details_frame, text="Naam:").grid(row=0, column=0, sticky='w', pady=2)
+        self.entry_name = tk.Entry(details_frame, width=40)
+        self.entry_name.grid(row=0, column=1, sticky='ew', pady=2)
+        tk.Label(details_frame, text="Type:").grid(row=1, column=0, sticky='w', pady=2)
+        self.type_var = tk.StringVar(value=self.PROVIDER_TYPES["xtream"])
+        ttk.Combobox(details_frame, textvariable=self.type_var, values=list(self.PROVIDER_TYPES.values()),
+                     state="readonly").grid(row=1, column=1, sticky='ew', pady=2)
+        tk.Label(details_frame, text="Server of playlist-URL:").grid(row=2, column=0, sticky='w', pady=2)
+        self.entry_server = tk.Entry(details_frame)
+        self.entry_server.grid(row=2, column=1, sticky='ew', pady=2)
+        tk.Label(details_frame, text="Gebruikersnaam:").grid(row=3, column=0, sticky='w', pady=2)
+        self.entry_user = tk.Entry(details_frame)
+        self.entry_user.grid(row=3, column=1, sticky='ew', pady=2)
+        tk.Label(details_frame, text="Wachtwoord:").grid(row=4, column=0, sticky='w', pady=2)
+        self.entry_pass = tk.Entry(details_frame, show="*")
+        self.entry_pass.grid(row=4, column=1, sticky='ew', pady=2)
+
+        tk.Button(details_frame, text="Opslaan", command=self.save_provider, bg="#cceeff").grid(row=5, column=0, columnspan=2, sticky='ew', pady=10)
+        tk.Button(details_frame, text="Sluiten", command=self.close).grid(row=6, column=0, columnspan=2, sticky='ew')
+
+        self.populate_list()
+        self.top.wait_window()
+
+    def populate_list(self):
+        self.listbox.delete(0, tk.END)
+        for p in self.providers: self.listbox.insert(tk.END, p['name'])
+
+    def on_select(self, event=None):
+        sel = self.listbox.curselection()
+        if not sel: return
+        p = self.providers[sel[0]]
+        self.entry_name.delete(0, tk.END); self.entry_name.insert(0, p.get('name', ''))
+        self.type_var.set(self.PROVIDER_TYPES.get(p.get('type', 'xtream'), self.PROVIDER_TYPES["xtream"]))
+        self.entry_server.delete(0, tk.END); self.entry_server.insert(0, p.get('server', ''))
+        self.entry_user.delete(0, tk.END); self.entry_user.insert(0, p.get('username', ''))
+        self.entry_pass.delete(0, tk.END)
+
+    def new_provider(self):
+        self.listbox.selection_clear(0, tk.END)
+        self.entry_name.delete(0, tk.END); self.entry_server.delete(0, tk.END)
+        self.entry_user.delete(0, tk.END); self.entry_pass.delete(0, tk.END)
+        self.type_var.set(self.PROVIDER_TYPES["xtream"])
+        self.entry_name.focus_set()
+
+    def delete_provider(self):
+        sel = self.listbox.curselection()
+        if not sel: return
+        if messagebox.askyesno("Verwijderen", "Weet je zeker dat je deze provider wilt verwijderen?", parent=self.top):
+            del self.providers[sel[0]]
+            self.populate_list()
+            self.new_provider()
+
+    def move_provider(self, step):
+        """Verschuift een provider in de lijst; bij samenvoegen bepaalt de volgorde de prioriteit."""
+        sel = self.listbox.curselection()
+        if not sel: return
+        i, j = sel[0], sel[0] + step
+        if not 0 <= j < len(self.providers): return
+        self.providers[i], self.providers[j] = self.providers[j], self.providers[i]
+        self.populate_list()
+        self.listbox.selection_set(j)
+
+    def save_provider(self):
+        name = self.entry_name.get().strip()
+        if not name: return messagebox.showerror("Fout", "Provider naam is verplicht.", parent=self.top)
+
+        new_data = {"name": name, "server": self.entry_server.get().strip(), "username": self.entry_user.get().strip()}
+        provider_type = next(k for k, v in self.PROVIDER_TYPES.items() if v == self.type_var.get())
+        if provider_type != "xtream": new_data["type"] = provider_type
+        pw = self.entry_pass.get()
+        
+        existing_provider = next((p for p in self.providers if p['name'] == name), None)
+
+        if pw: new_data["password"] = self.encrypt_func(pw)
+        elif existing_provider: new_data["password"] = existing_provider.get('password', '')
+
+        if existing_provider:
+            self.providers[self.providers.index(existing_provider)] = new_data
+        else:
+            self.providers.append(new_data)
+        
+        self.populate_list()
+        for i, p in enumerate(self.providers):
+            if p['name'] == name:
+                self.listbox.selection_set(i)
+                break
+
+    def close(self):
+        self.saved_providers = self.providers
+        self.top.destroy()
+
+
+def run_gui():
+    """Start de Tkinter GUI."""
+    main_root = tk.Tk()
+    app = StrmManagerApp(main_root)
+    main_root.mainloop()